@@ -27,12 +27,109 @@
 # =============================================================================
 
 import requests  # HTTP 요청을 보내기 위한 라이브러리
-from typing import List, Dict, Optional  # 타입 힌트 (코드의 가독성 향상)
+from typing import Any, List, Dict, Optional, Tuple  # 타입 힌트 (코드의 가독성 향상)
 import logging  # 로깅 기능 (프로그램 실행 과정 기록)
+import re  # 정규식 (공백 정리 및 폴백 HTML 처리용)
+import html  # HTML 엔티티 디코딩
+import hashlib  # 본문 중복 판별용 해시
+from urllib.parse import quote  # 첨부파일명 URL 인코딩
+from functools import lru_cache  # 첨부파일 목록 캐시
+from concurrent.futures import ThreadPoolExecutor  # 하위 페이지 병렬 조회용 스레드 풀
+from requests.adapters import HTTPAdapter  # 연결 풀 크기 조정용 어댑터
+from urllib3.util.retry import Retry  # 일시적 오류 자동 재시도 정책
+
+from config import config
+
+# selectolax 라이브러리 가져오기 시도 (C 엔진 기반 고속 HTML 파서)
+try:
+    from selectolax.parser import HTMLParser  # HTML 파싱과 텍스트 추출을 C 코드에서 한 번에 처리
+    SELECTOLAX_AVAILABLE = True  # selectolax 사용 가능
+except ImportError:
+    # selectolax가 설치되지 않은 경우 정규식 기반 처리로 대체
+    SELECTOLAX_AVAILABLE = False
+
+# orjson 라이브러리 가져오기 시도 (Rust 기반 고속 JSON 파서)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# brotli 패키지가 있어야 br 압축 응답을 해제할 수 있음
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 서버에 요청할 응답 압축 방식
+ACCEPT_ENCODING = 'gzip, br' if BROTLI_AVAILABLE else 'gzip'
 
 # 이 파일 전용 로거 생성
 logger = logging.getLogger(__name__)
 
+# HTML 처리용 정규식 (모듈 로드 시 한 번만 컴파일)
+# 블록/줄바꿈 태그는 공백으로, 나머지 태그는 빈 문자열로 바꾸는 단일 패턴
+_RE_HTML_TAG = re.compile(
+    r'</?(?P<block>p|div|h[1-6]|li|td|th|section|article|br|hr)\b[^>]*>|<[^>]+>'
+)
+_RE_WS = re.compile(r'\s+')  # 연속된 공백 문자
+
+
+
+# 기본으로 요청할 본문 형식 (storage 하나에 페이지 텍스트가 대부분 포함됨)
+DEFAULT_BODY_FORMATS = ('storage',)
+
+# 이 길이를 넘는 storage 텍스트가 있으면 다른 본문 형식은 추출하지 않음
+_MIN_SINGLE_BODY_TEXT = 32
+
+
+def _json(response) -> Any:
+    """응답 본문을 JSON으로 파싱 (orjson이 있으면 orjson 사용)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _build_expand(bodies: Tuple[str, ...], fields: str) -> str:
+    """REST API expand 파라미터 생성 (요청한 본문 형식만 포함)"""
+    return ','.join([f'body.{body}' for body in bodies] + [fields])
+
+
+def _replace_tag(match) -> str:
+    """_RE_HTML_TAG 치환 함수: 블록 태그는 공백, 그 외 태그는 제거"""
+    return ' ' if match.group('block') else ''
+
+
+def _fingerprint(text: str) -> bytes:
+    """본문 텍스트의 짧은 해시 (본문 간 중복 판별용)"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def _html_to_text(html_content: str) -> str:
+    """
+    HTML 문자열에서 텍스트만 추출합니다.
+    
+    selectolax가 설치되어 있으면 C 파서로 태그 제거와 엔티티 디코딩을 한 번에 처리하고,
+    없으면 정규식 기반 처리로 대체합니다.
+    """
+    if SELECTOLAX_AVAILABLE:
+        tree = HTMLParser(html_content)
+        root = tree.body or tree.root
+        # 텍스트 노드 사이에 공백을 넣어 블록 구조(문단, 셀 등)를 유지
+        text = root.text(separator=' ', strip=True) if root is not None else ""
+        return _RE_WS.sub(' ', text).strip()
+    
+    # HTML 태그 제거하되 내용은 보존 (블록 태그는 공백으로 바꿔 구조 유지)
+    # 한 번의 스캔으로 처리하여 문자열을 여러 번 훑지 않음
+    text = _RE_HTML_TAG.sub(_replace_tag, html_content)
+    
+    # HTML 엔티티 디코딩 (이름/10진수/16진수 엔티티 모두 처리, &nbsp;는 공백 정리 단계에서 공백으로 변환)
+    text = html.unescape(text)
+    
+    # 연속된 공백, 탭, 개행 문자 정리
+    return _RE_WS.sub(' ', text).strip()
+
 # =============================================================================
 # Confluence API 클라이언트 메인 클래스
 # =============================================================================
@@ -67,20 +164,34 @@ class ConfluenceClient:
         # 세션에 인증 정보 설정 (HTTP Basic Auth)
         self.session.auth = (username, password)
         
+        # 병렬 조회 시 연결 풀이 병목이 되지 않도록 풀 크기를 확장하고,
+        # 일시적인 서버 오류(502/503/504)는 자동으로 재시도
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # 페이지별 첨부파일 목록 캐시 (같은 페이지의 여러 파일 조회 시 HTTP 요청 1회로 처리)
+        self._get_attachments_indexed = lru_cache(maxsize=256)(self._index_page_attachments)
+        
         # 모든 요청에 공통으로 사용할 HTTP 헤더 설정
+        # (GET 요청만 사용하므로 Content-Type은 지정하지 않고, 압축 응답을 요청)
         self.session.headers.update({
-            'Content-Type': 'application/json',  # 요청 데이터 형식
-            'Accept': 'application/json'         # 응답 데이터 형식
+            'Accept': 'application/json',       # 응답 데이터 형식
+            'Accept-Encoding': ACCEPT_ENCODING  # 응답 압축 (br은 brotli 설치 시에만 요청)
         })
     
-    def test_connection(self) -> Dict[str, any]:
+    def test_connection(self) -> Dict[str, Any]:
         """Confluence 서버 연결 테스트"""
         try:
             # 현재 사용자 정보 조회로 연결 테스트
             response = self.session.get(f"{self.base_url}/rest/api/user/current")
             
             if response.status_code == 200:
-                user_info = response.json()
+                user_info = _json(response)
                 return {
                     "status": "success",
                     "message": f"연결 성공: {user_info.get('displayName', 'Unknown User')}",
@@ -107,18 +218,18 @@ class ConfluenceClient:
                 "message": f"연결 오류: {str(e)}"
             }
     
-    def get_page_content(self, page_id: str) -> Optional[Dict]:
-        """페이지 상세 정보 조회 (전체 BODY 내용 포함)"""
+    def get_page_content(self, page_id: str, bodies: Tuple[str, ...] = DEFAULT_BODY_FORMATS) -> Optional[Dict]:
+        """페이지 상세 정보 조회 (bodies에 지정한 BODY 형식 포함)"""
         try:
             url = f"{self.base_url}/rest/api/content/{page_id}"
             params = {
-                'expand': 'body.storage,body.view,body.export_view,version,history.createdBy,history.lastUpdated,space,metadata,children.page'
+                'expand': _build_expand(bodies, 'version,history.createdBy,history.lastUpdated,space,metadata,children.page')
             }
             
             response = self.session.get(url, params=params)
             
             if response.status_code == 200:
-                page_data = response.json()
+                page_data = _json(response)
                 logger.debug(f"페이지 데이터 키: {list(page_data.keys())}")
                 if 'body' in page_data:
                     logger.debug(f"Body 키: {list(page_data['body'].keys())}")
@@ -130,40 +241,77 @@ class ConfluenceClient:
             logger.error(f"페이지 조회 오류: {str(e)}")
             return None
     
-    def get_page_children(self, page_id: str, limit: int = 50) -> List[Dict]:
-        """페이지 하위 페이지 목록 조회 (전체 BODY 내용 포함)"""
+    def get_page_children(self, page_id: str, limit: int = 50, bodies: Tuple[str, ...] = DEFAULT_BODY_FORMATS,
+                          include_body: bool = True) -> List[Dict]:
+        """
+        페이지 하위 페이지 목록 조회
+        
+        include_body가 True이면 bodies에 지정한 BODY 형식을 포함하고, False이면
+        버전/스페이스 정보만 조회합니다. 하위 페이지가 limit보다 많으면
+        응답의 _links.next를 따라가며 전체 목록을 가져옵니다.
+        """
         try:
+            if include_body:
+                expand = _build_expand(bodies, 'version,history.createdBy,history.lastUpdated,space')
+            else:
+                expand = 'version,space'
+            
             url = f"{self.base_url}/rest/api/content/{page_id}/child/page"
-            params = {
-                'limit': limit,
-                'expand': 'body.storage,body.view,body.export_view,version,history.createdBy,history.lastUpdated,space'
-            }
+            params = {'limit': limit, 'expand': expand}
+            results = []
             
-            response = self.session.get(url, params=params)
+            while url:
+                response = self.session.get(url, params=params)
+                
+                if response.status_code != 200:
+                    logger.error(f"하위 페이지 조회 실패: {response.status_code}")
+                    break
+                
+                data = _json(response)
+                results.extend(data.get('results', []))
+                
+                # 다음 페이지 링크에는 limit/start/expand가 이미 포함되어 있음
+                links = data.get('_links', {})
+                next_link = links.get('next')
+                url = f"{links.get('base', self.base_url)}{next_link}" if next_link else None
+                params = None
             
-            if response.status_code == 200:
-                results = response.json().get('results', [])
-                logger.info(f"하위 페이지 조회 성공: {len(results)}개")
-                return results
-            else:
-                logger.error(f"하위 페이지 조회 실패: {response.status_code}")
-                return []
+            logger.info(f"하위 페이지 조회 성공: {len(results)}개")
+            return results
         except Exception as e:
             logger.error(f"하위 페이지 조회 오류: {str(e)}")
             return []
     
-    def get_all_descendants(self, page_id: str) -> List[Dict]:
-        """페이지의 모든 하위 페이지를 재귀적으로 조회"""
+    def get_page_children_metadata(self, page_id: str) -> List[Dict]:
+        """하위 페이지 목록을 본문 없이 조회 (트리 탐색용, 응답 크기 최소화)"""
+        return self.get_page_children(page_id, include_body=False)
+    
+    def get_all_descendants(self, page_id: str, include_body: bool = True) -> List[Dict]:
+        """
+        페이지의 모든 하위 페이지를 단계별(BFS)로 병렬 조회
+        
+        include_body가 False이면 본문 없이 메타데이터만 조회하므로, 필요한 페이지의
+        본문은 get_page_content로 따로 가져와야 합니다.
+        """
+        fetch_children = self.get_page_children if include_body else self.get_page_children_metadata
         all_pages = []
+        current_level = [page_id]
+        # 이미 방문한 페이지 (자기 자신이나 상위 페이지가 하위로 다시 나타나는 순환 방지)
+        seen = {page_id}
         
-        def get_descendants_recursive(pid: str):
-            children = self.get_page_children(pid)
-            for child in children:
-                all_pages.append(child)
-                # 재귀적으로 하위 페이지 조회
-                get_descendants_recursive(child['id'])
+        # 같은 깊이의 페이지들은 서로 독립적이므로 하위 목록 요청을 동시에 보냄
+        with ThreadPoolExecutor(max_workers=config.CONFLUENCE_MAX_WORKERS) as executor:
+            while current_level:
+                next_level = []
+                for children in executor.map(fetch_children, current_level):
+                    for child in children:
+                        if child['id'] in seen:
+                            continue
+                        seen.add(child['id'])
+                        all_pages.append(child)
+                        next_level.append(child['id'])
+                current_level = next_level
         
-        get_descendants_recursive(page_id)
         return all_pages
     
     def get_page_history(self, page_id: str) -> Optional[Dict]:
@@ -173,7 +321,7 @@ class ConfluenceClient:
             response = self.session.get(url)
             
             if response.status_code == 200:
-                return response.json()
+                return _json(response)
             else:
                 logger.error(f"페이지 히스토리 조회 실패: {response.status_code}")
                 return None
@@ -181,78 +329,45 @@ class ConfluenceClient:
             logger.error(f"페이지 히스토리 조회 오류: {str(e)}")
             return None
     
-    def extract_text_from_content(self, content_body: Dict) -> str:
-        """Confluence 페이지 본문에서 전체 텍스트 추출 (모든 BODY 내용 포함)"""
+    def extract_text_from_content(self, content_body: Dict[str, Any], prefer_single: bool = True) -> str:
+        """
+        Confluence 페이지 본문에서 텍스트 추출
+        
+        prefer_single이 True이면 storage 형식에서 충분한 텍스트를 얻은 경우 바로 반환하고,
+        False이면 export_view/view 형식까지 모두 병합합니다.
+        """
         try:
-            import re
-            
-            text_content = ""
+            text_parts = []
             extracted_formats = []
+            # 이미 병합한 본문의 지문(해시) - 전체 텍스트를 다시 훑는 부분 문자열 검사 대신 사용
+            seen_fingerprints = set()
             
-            # 1. storage 형식에서 추출 (우선순위: 가장 완전한 형식)
-            if content_body and 'storage' in content_body and content_body['storage'].get('value'):
-                html_content = content_body['storage']['value']
-                logger.debug(f"Storage HTML 콘텐츠 길이: {len(html_content)}")
+            # storage(가장 완전한 형식) -> export_view(렌더링된 내용) -> view(폴백) 순서로 추출
+            for body_format in ('storage', 'export_view', 'view'):
+                if not (content_body and body_format in content_body and content_body[body_format].get('value')):
+                    continue
                 
-                # HTML 태그 제거하되 내용은 보존
-                # 먼저 일부 태그를 공백으로 변환하여 구조 유지
-                html_content = re.sub(r'</(p|div|h[1-6]|li|td|th|section|article)>', ' ', html_content)
-                html_content = re.sub(r'<(br|hr)\s*/?>', ' ', html_content)
+                html_content = content_body[body_format]['value']
+                logger.debug(f"{body_format} HTML 콘텐츠 길이: {len(html_content)}")
                 
-                # 모든 HTML 태그 제거
-                text_content = re.sub(r'<[^>]+>', '', html_content)
+                body_text = _html_to_text(html_content)
+                extracted_formats.append(body_format)
                 
-                # HTML 엔티티 디코딩
-                text_content = text_content.replace('&nbsp;', ' ')
-                text_content = text_content.replace('&amp;', '&')
-                text_content = text_content.replace('&lt;', '<')
-                text_content = text_content.replace('&gt;', '>')
-                text_content = text_content.replace('&quot;', '"')
-                text_content = text_content.replace('&#39;', "'")
-                text_content = text_content.replace('&apos;', "'")
+                # 앞서 병합한 본문과 동일한 내용이면 건너뜀 (중복 제거)
+                fingerprint = _fingerprint(body_text)
+                if body_text and fingerprint not in seen_fingerprints:
+                    seen_fingerprints.add(fingerprint)
+                    text_parts.append(body_text)
                 
-                # 연속된 공백, 탭, 개행 문자 정리
-                text_content = re.sub(r'[\s\t\n\r]+', ' ', text_content)
-                text_content = text_content.strip()
-                extracted_formats.append("storage")
+                # storage만으로 충분하면 나머지 형식은 처리하지 않음
+                if (prefer_single and body_format == 'storage'
+                        and len(body_text) > _MIN_SINGLE_BODY_TEXT):
+                    break
             
-            # 2. export_view 형식에서 추가 추출 (렌더링된 내용)
-            if content_body and 'export_view' in content_body and content_body['export_view'].get('value'):
-                export_html = content_body['export_view']['value']
-                logger.debug(f"Export view HTML 콘텐츠 길이: {len(export_html)}")
-                
-                export_text = re.sub(r'<[^>]+>', '', export_html)
-                export_text = re.sub(r'\s+', ' ', export_text).strip()
-                
-                # storage 내용과 병합 (중복 제거)
-                if export_text and export_text not in text_content:
-                    if text_content:
-                        text_content = text_content + " " + export_text
-                    else:
-                        text_content = export_text
-                extracted_formats.append("export_view")
-            
-            # 3. view 형식에서 추가 추출 (폴백)
-            if content_body and 'view' in content_body and content_body['view'].get('value'):
-                view_html = content_body['view']['value']
-                logger.debug(f"View HTML 콘텐츠 길이: {len(view_html)}")
-                
-                view_text = re.sub(r'<[^>]+>', '', view_html)
-                view_text = re.sub(r'\s+', ' ', view_text).strip()
-                
-                # 기존 내용과 병합 (중복 제거)
-                if view_text and view_text not in text_content:
-                    if text_content:
-                        text_content = text_content + " " + view_text
-                    else:
-                        text_content = view_text
-                extracted_formats.append("view")
+            # 각 본문은 이미 공백이 정리되어 있으므로 공백 하나로 이어 붙임
+            text_content = " ".join(text_parts)
             
-            # 최종 텍스트 정리
             if text_content:
-                # 중복된 공백 제거
-                text_content = re.sub(r'\s+', ' ', text_content).strip()
-                
                 logger.info(f"텍스트 추출 완료: {len(text_content)}자 (형식: {', '.join(extracted_formats)})")
                 return text_content
             else:
@@ -263,7 +378,7 @@ class ConfluenceClient:
             logger.error(f"텍스트 추출 오류: {str(e)}")
             return ""
     
-    def get_page_url(self, page_id: str, space_key: str = None) -> str:
+    def get_page_url(self, page_id: str, space_key: Optional[str] = None) -> str:
         """페이지 URL 생성"""
         if space_key:
             return f"{self.base_url}/spaces/{space_key}/pages/{page_id}"
@@ -277,7 +392,7 @@ class ConfluenceClient:
             response = self.session.get(url)
             
             if response.status_code == 200:
-                result = response.json()
+                result = _json(response)
                 return result.get('results', [])
             else:
                 logger.error(f"첨부파일 목록 조회 실패: {response.status_code}")
@@ -289,34 +404,45 @@ class ConfluenceClient:
     def download_attachment(self, page_id: str, filename: str) -> Optional[bytes]:
         """페이지의 첨부파일 다운로드"""
         try:
-            # URL 인코딩을 위한 파일명 처리
-            import urllib.parse
-            encoded_filename = urllib.parse.quote(filename)
+            # URL 인코딩을 위한 파일명 처리 (파일명의 '/'도 인코딩)
+            encoded_filename = quote(filename, safe='')
             
             # Confluence 표준 다운로드 URL 사용 
             download_url = f"{self.base_url}/download/attachments/{page_id}/{encoded_filename}"
             
-            # 다운로드를 위한 별도 세션 (Content-Type 헤더 제거)
-            download_session = requests.Session()
-            download_session.auth = (self.username, self.password)
-            
             logger.debug(f"첨부파일 다운로드 시도: {download_url}")
             
-            response = download_session.get(download_url, stream=True, timeout=30)
+            # 기존 세션을 재사용해 연결(keep-alive)을 유지하고, 모든 파일 형식을 받도록 Accept만 변경
+            response = self.session.get(
+                download_url,
+                stream=True,
+                timeout=30,
+                headers={'Accept': '*/*'}
+            )
             
             if response.status_code == 200:
                 # 파일 크기 제한 (10MB)
                 max_size = 10 * 1024 * 1024
-                content = b""
+                
+                # Content-Length 헤더가 있으면 본문을 받기 전에 크기 확인
+                content_length = response.headers.get('Content-Length')
+                if content_length and content_length.isdigit() and int(content_length) > max_size:
+                    logger.warning(f"첨부파일 크기가 너무 큼: {filename}")
+                    response.close()
+                    return None
+                
+                # bytearray에 이어 붙여 매 청크마다 전체를 복사하지 않도록 함
+                content = bytearray()
                 
                 for chunk in response.iter_content(chunk_size=8192):
-                    content += chunk
+                    content.extend(chunk)
                     if len(content) > max_size:
                         logger.warning(f"첨부파일 크기가 너무 큼: {filename}")
+                        response.close()
                         return None
                 
                 logger.info(f"첨부파일 다운로드 완료: {filename} ({len(content)} bytes)")
-                return content
+                return bytes(content)
                 
             else:
                 logger.error(f"첨부파일 다운로드 실패: {response.status_code} - {response.text[:200]}")
@@ -326,23 +452,34 @@ class ConfluenceClient:
             logger.error(f"첨부파일 다운로드 오류: {str(e)}")
             return None
     
+    def _index_page_attachments(self, page_id: str) -> Dict[str, Dict]:
+        """페이지 첨부파일 목록을 파일명 -> 첨부파일 정보 사전으로 변환"""
+        index = {}
+        for attachment in self.get_page_attachments(page_id):
+            # 같은 이름이 여러 개면 먼저 나온 첨부파일 사용
+            index.setdefault(attachment.get('title'), attachment)
+        return index
+    
+    def clear_cache(self) -> None:
+        """첨부파일 목록 캐시 비우기 (장시간 실행되는 서버에서 사용)"""
+        self._get_attachments_indexed.cache_clear()
+    
     def get_attachment_info(self, page_id: str, filename: str) -> Optional[Dict]:
         """첨부파일 정보 조회"""
         try:
-            attachments = self.get_page_attachments(page_id)
+            attachment = self._get_attachments_indexed(page_id).get(filename)
             
-            for attachment in attachments:
-                if attachment.get('title') == filename:
-                    return {
-                        'id': attachment.get('id'),
-                        'title': attachment.get('title'),
-                        'mediaType': attachment.get('extensions', {}).get('mediaType'),
-                        'fileSize': attachment.get('extensions', {}).get('fileSize'),
-                        'download_url': f"{self.base_url}/rest/api/content/{attachment.get('id')}/download"
-                    }
+            if attachment is None:
+                return None
             
-            return None
+            return {
+                'id': attachment.get('id'),
+                'title': attachment.get('title'),
+                'mediaType': attachment.get('extensions', {}).get('mediaType'),
+                'fileSize': attachment.get('extensions', {}).get('fileSize'),
+                'download_url': f"{self.base_url}/rest/api/content/{attachment.get('id')}/download"
+            }
             
         except Exception as e:
             logger.error(f"첨부파일 정보 조회 오류: {str(e)}")
-            return None
\ No newline at end of file
+            return None
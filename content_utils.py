@@ -3,18 +3,128 @@
 HTML/이미지 감지 로직의 중복 코드를 해결하기 위한 모듈
 """
 import re
+import logging
+import hashlib
+import platform
+import threading
+from collections import Counter, OrderedDict
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    import xxhash  # XXH3: 비암호화 고속 해시 (분석 결과 캐시 키)
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import ahocorasick  # pyahocorasick: 다중 문자열 검색 오토마톤
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# PyPy에서는 C 확장 호출(cpyext) 비용이 커서 JIT 컴파일되는 표준 re/순수 Python 경로가 더 빠름
+IS_PYPY = platform.python_implementation() == "PyPy"
+
 from logging_config import get_logger
 from exceptions import ContentAnalysisError
 
 logger = get_logger("content_utils")
 
+# 분석 결과 캐시 최대 항목 수
+_RESULT_CACHE_SIZE = 4096
+
+# 폴백 키워드 후보: 한글/영문/숫자 연속 구간 중 길이 2~15자인 것만 (길이 필터를 정규식 엔진에서 처리)
+_RE_KEYWORD_CANDIDATE = re.compile(r'(?<![가-힣a-zA-Z0-9])[가-힣a-zA-Z0-9]{2,15}(?![가-힣a-zA-Z0-9])')
+
+# LLM 키워드 정리 시 제외할 구문들
+SKIP_PHRASES = (
+    "이 페이지", "내용이", "매우", "짧고", "의미", "없는", "내용이므로",
+    "키워드를", "추출하기", "어렵습니다", "제공된", "내용만으로는",
+    "다음과", "같은", "추출할", "수", "있습니다", "어려운", "상황"
+)
+
+SKIP_PHRASES_EN = (
+    "content", "keywords", "extract", "difficult", "short",
+    "meaningful", "following", "provide", "limited", "based"
+)
+
+# 리터럴 판별용 정규식 메타문자
+_RE_METACHARS = re.compile(r'[\\.^$*+?{}\[\]|()]')
+
+
+def _content_key(content: str):
+    """분석 결과 캐시 키 (XXH3 64비트, 없으면 blake2b 16바이트 다이제스트)"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(content)
+    return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _build_skip_phrase_matcher():
+    """
+    제외 구문 전체를 한 번에 검사하는 매처 생성 (pyahocorasick 우선, 없으면 정규식 alternation)
+    
+    한글 구문은 소문자화해도 변하지 않으므로 소문자화된 키워드 하나로 두 목록을 함께 검사합니다.
+    """
+    if AHOCORASICK_AVAILABLE and not IS_PYPY:
+        automaton = ahocorasick.Automaton()
+        for phrase in SKIP_PHRASES + SKIP_PHRASES_EN:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+        return lambda lowered: next(automaton.iter(lowered), None) is not None
+    
+    skip_regex = re.compile("|".join(re.escape(phrase) for phrase in SKIP_PHRASES + SKIP_PHRASES_EN))
+    return lambda lowered: skip_regex.search(lowered) is not None
+
+
+_contains_skip_phrase = _build_skip_phrase_matcher()
+
+
+def _compile_union(patterns: List[str], flags: int = 0):
+    """여러 정규식 패턴을 하나의 alternation 패턴으로 컴파일"""
+    union = "|".join(f"(?:{pattern})" for pattern in patterns)
+    return re.compile(union, flags)
+
+
+def _split_literals(patterns: List[str]) -> Tuple[Tuple[str, ...], List[str]]:
+    """
+    패턴 목록을 정규식 메타문자가 없는 리터럴(소문자)과 실제 정규식 패턴으로 분리
+    """
+    literals = tuple(p.lower() for p in patterns if not _RE_METACHARS.search(p))
+    regex_patterns = [p for p in patterns if _RE_METACHARS.search(p)]
+    return literals, regex_patterns
+
 
-@dataclass
+def _contains_any(lowered: str, literals: Tuple[str, ...]) -> bool:
+    """소문자화된 문자열에 리터럴 중 하나라도 포함되어 있는지 검사"""
+    return any(literal in lowered for literal in literals)
+
+
+def _make_detector(search, literals: Tuple[str, ...] = ()):
+    """
+    컴파일된 매처의 search와 리터럴 목록을 클로저에 고정한 감지 함수 생성
+    
+    호출 시 인스턴스 속성 조회 없이 바로 매처를 실행합니다. 정규식이 실패하면
+    소문자화한 콘텐츠에서 리터럴 포함 여부를 확인합니다.
+    """
+    if literals:
+        def detect(content: str) -> bool:
+            if not content:
+                return False
+            if search(content):
+                return True
+            return _contains_any(content.lower(), literals)
+    else:
+        def detect(content: str) -> bool:
+            if not content:
+                return False
+            return bool(search(content))
+    return detect
+
+
+@dataclass(frozen=True, slots=True)
 class ContentAnalysisResult:
-    """콘텐츠 분석 결과"""
+    """콘텐츠 분석 결과 (캐시되어 공유되므로 불변)"""
     content_type: str
     special_keywords: List[str]
     is_html: bool
@@ -23,6 +133,9 @@ class ContentAnalysisResult:
     content_length: int
     word_count: int
     is_empty: bool
+    has_code: bool = False
+    has_table: bool = False
+    has_list: bool = False
 
 
 class ContentAnalyzer:
@@ -65,6 +178,38 @@ class ContentAnalyzer:
         r'파일',                                    # 한글 파일
     ]
     
+    # 코드 패턴들
+    CODE_PATTERNS = [
+        r'```[\s\S]*?```',      # 마크다운 코드 블록
+        r'`[^`]+`',             # 인라인 코드
+        r'<code[^>]*>',         # HTML code 태그
+        r'<pre[^>]*>',          # HTML pre 태그
+        r'function\s+\w+\s*\(', # 함수 정의
+        r'class\s+\w+\s*{',     # 클래스 정의
+        r'def\s+\w+\s*\(',      # Python 함수
+        r'#include\s*<',        # C/C++ include
+        r'import\s+\w+',        # Python/Java import
+        r'console\.log\s*\(',   # JavaScript console.log
+    ]
+    
+    # 테이블 패턴들
+    TABLE_PATTERNS = [
+        r'<table[^>]*>',        # HTML table
+        r'\|.*\|.*\|',          # 마크다운 테이블
+        r'<tr[^>]*>',           # HTML table row
+        r'<td[^>]*>',           # HTML table cell
+        r'<th[^>]*>',           # HTML table header
+    ]
+    
+    # 리스트 패턴들
+    LIST_PATTERNS = [
+        r'<ul[^>]*>',           # HTML unordered list
+        r'<ol[^>]*>',           # HTML ordered list
+        r'<li[^>]*>',           # HTML list item
+        r'^\s*[-*+]\s+',        # 마크다운 unordered list
+        r'^\s*\d+\.\s+',        # 마크다운 ordered list
+    ]
+    
     # 특수 콘텐츠 키워드 매핑 (각 카테고리당 대표 키워드 1개)
     CONTENT_TYPE_KEYWORDS = {
         'html': 'HTML',
@@ -76,11 +221,39 @@ class ContentAnalyzer:
         'list': '목록',
     }
     
+    # 정규식 부분이 ASCII 전용인 카테고리 (한글 리터럴은 대소문자 구분이 없어 영향 없음)
+    ASCII_FEATURE_GROUPS = frozenset({'image', 'attachment'})
+    
+    # 단일 스캔으로 함께 감지하는 카테고리 (named group 이름 -> 패턴 목록)
+    FEATURE_PATTERN_GROUPS = {
+        'html': HTML_PATTERNS,
+        'image': IMAGE_PATTERNS,
+        'attachment': ATTACHMENT_PATTERNS,
+        'code': CODE_PATTERNS,
+        'table': TABLE_PATTERNS,
+        'list': LIST_PATTERNS,
+    }
+    
     def __init__(self):
         """콘텐츠 분석기 초기화"""
-        self.compiled_html_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.HTML_PATTERNS]
-        self.compiled_image_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.IMAGE_PATTERNS]
-        self.compiled_attachment_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.ATTACHMENT_PATTERNS]
+        # has_*_content 헬퍼용 그룹별 정규식 (analyze_content는 _scan_features로 전체를 한 번에 검사)
+        self.html_union = _compile_union(self.HTML_PATTERNS, re.IGNORECASE)
+        # 이미지/첨부파일 그룹의 리터럴(screenshot, 첨부 등)은 부분 문자열 검사로 먼저 확인하고
+        # 정규식은 나머지 패턴에만 사용
+        self.image_literals, image_regex = _split_literals(self.IMAGE_PATTERNS)
+        self.attachment_literals, attachment_regex = _split_literals(self.ATTACHMENT_PATTERNS)
+        # 남은 정규식(태그, 확장자 등)은 ASCII 전용이므로 유니코드 대소문자 테이블 없이 매칭
+        self.image_union = _compile_union(image_regex, re.IGNORECASE | re.ASCII)
+        self.attachment_union = _compile_union(attachment_regex, re.IGNORECASE | re.ASCII)
+        # 카테고리별 감지 함수 (매처를 클로저에 고정; 이미지/첨부파일은 정규식 후 리터럴 검사)
+        self._detect_html = _make_detector(self.html_union.search)
+        self._detect_images = _make_detector(self.image_union.search, self.image_literals)
+        self._detect_attachments = _make_detector(self.attachment_union.search, self.attachment_literals)
+        # 남은 카테고리 조합별 통합 정규식 캐시 (카테고리당 named group 1개)
+        self._feature_regex_cache: Dict[Tuple[str, ...], Any] = {}
+        # 콘텐츠 해시 -> 분석 결과 LRU 캐시 (제목은 결과에 영향이 없어 키에서 제외)
+        self._result_cache: OrderedDict = OrderedDict()
+        self._result_cache_lock = threading.Lock()
     
     def analyze_content(self, content: str, title: str = "") -> ContentAnalysisResult:
         """콘텐츠 종합 분석"""
@@ -88,21 +261,31 @@ class ContentAnalyzer:
             if not content:
                 content = ""
             
+            # 같은 본문을 다시 분석하는 경우 (증분 수집, 재시도) 캐시된 결과 반환
+            cache_key = _content_key(content)
+            with self._result_cache_lock:
+                cached_result = self._result_cache.get(cache_key)
+                if cached_result is not None:
+                    self._result_cache.move_to_end(cache_key)
+                    return cached_result
+            
             # 기본 정보 분석
             content_length = len(content)
-            word_count = len(re.findall(r'\S+', content))
+            word_count = len(content.split())
             is_empty = content_length < 10
             
-            # HTML 감지
-            is_html = self._detect_html(content)
-            
-            # 이미지/첨부파일 감지
-            has_images = self._detect_images(content)
-            has_attachments = self._detect_attachments(content)
+            # HTML/이미지/첨부파일/코드/표/목록을 한 번의 스캔으로 감지
+            features = self._scan_features(content)
+            is_html = features['html']
+            has_images = features['image']
+            has_attachments = features['attachment']
+            has_code = features['code']
+            has_table = features['table']
+            has_list = features['list']
             
             # 콘텐츠 타입 결정
             content_type = self._determine_content_type(
-                content, is_html, has_images, has_attachments, is_empty
+                is_html, has_images, has_attachments, is_empty, has_code, has_table, has_list
             )
             
             # 특수 키워드 생성
@@ -118,22 +301,32 @@ class ContentAnalyzer:
                 has_attachments=has_attachments,
                 content_length=content_length,
                 word_count=word_count,
-                is_empty=is_empty
+                is_empty=is_empty,
+                has_code=has_code,
+                has_table=has_table,
+                has_list=has_list
             )
             
-            logger.debug(
-                "콘텐츠 분석 완료",
-                extra_data={
-                    "title": title,
-                    "content_length": content_length,
-                    "word_count": word_count,
-                    "content_type": content_type,
-                    "special_keywords": special_keywords,
-                    "is_html": is_html,
-                    "has_images": has_images,
-                    "has_attachments": has_attachments
-                }
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "콘텐츠 분석 완료",
+                    extra_data={
+                        "title": title,
+                        "content_length": content_length,
+                        "word_count": word_count,
+                        "content_type": content_type,
+                        "special_keywords": special_keywords,
+                        "is_html": is_html,
+                        "has_images": has_images,
+                        "has_attachments": has_attachments
+                    }
+                )
+            
+            with self._result_cache_lock:
+                self._result_cache[cache_key] = result
+                if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                    # 가장 오래 사용하지 않은 항목 제거
+                    self._result_cache.popitem(last=False)
             
             return result
             
@@ -148,39 +341,54 @@ class ContentAnalyzer:
             )
             raise ContentAnalysisError(f"콘텐츠 분석 실패: {str(e)}", {"title": title})
     
-    def _detect_html(self, content: str) -> bool:
-        """HTML 콘텐츠 감지"""
-        if not content:
-            return False
-            
-        for pattern in self.compiled_html_patterns:
-            if pattern.search(content):
-                return True
-        return False
+    def _feature_regex(self, categories: Tuple[str, ...]):
+        """주어진 카테고리들의 패턴을 named group으로 묶은 통합 정규식 (조합별 캐시)"""
+        regex = self._feature_regex_cache.get(categories)
+        if regex is None:
+            groups = []
+            for name in categories:
+                body = '|'.join(f'(?:{pattern})' for pattern in self.FEATURE_PATTERN_GROUPS[name])
+                if name in self.ASCII_FEATURE_GROUPS:
+                    body = f'(?a:{body})'
+                groups.append(f'(?P<{name}>{body})')
+            # '^' 앵커는 목록 패턴에만 있으므로 MULTILINE을 전체에 적용해도 다른 그룹에는 영향 없음
+            regex = re.compile('|'.join(groups), re.IGNORECASE | re.MULTILINE)
+            self._feature_regex_cache[categories] = regex
+        return regex
     
-    def _detect_images(self, content: str) -> bool:
-        """이미지 콘텐츠 감지"""
-        if not content:
-            return False
-            
-        for pattern in self.compiled_image_patterns:
-            if pattern.search(content):
-                return True
-        return False
-    
-    def _detect_attachments(self, content: str) -> bool:
-        """첨부파일 콘텐츠 감지"""
+    def _scan_features(self, content: str) -> Dict[str, bool]:
+        """모든 카테고리를 앞에서부터 한 번 훑으며 감지
+        
+        매칭된 카테고리는 제외하고 같은 위치에서 이어서 검색하므로 (같은 위치에서
+        다른 카테고리가 가려지는 경우도 놓치지 않음) 전체 스캔은 사실상 1회이며,
+        모든 카테고리가 감지되면 즉시 종료한다.
+        """
+        features = dict.fromkeys(self.FEATURE_PATTERN_GROUPS, False)
         if not content:
-            return False
-            
-        for pattern in self.compiled_attachment_patterns:
-            if pattern.search(content):
-                return True
-        return False
+            return features
+        
+        # 리터럴만으로 확정되는 카테고리는 정규식 스캔 대상에서 제외
+        lowered = content.lower()
+        if _contains_any(lowered, self.image_literals):
+            features['image'] = True
+        if _contains_any(lowered, self.attachment_literals):
+            features['attachment'] = True
+        
+        remaining = tuple(name for name, found in features.items() if not found)
+        pos = 0
+        while remaining:
+            match = self._feature_regex(remaining).search(content, pos)
+            if match is None:
+                break
+            features[match.lastgroup] = True
+            remaining = tuple(name for name in remaining if name != match.lastgroup)
+            pos = match.start()
+        return features
     
-    def _determine_content_type(self, content: str, is_html: bool, has_images: bool, 
-                               has_attachments: bool, is_empty: bool) -> str:
-        """콘텐츠 타입 결정"""
+    def _determine_content_type(self, is_html: bool, has_images: bool, has_attachments: bool,
+                               is_empty: bool, has_code: bool, has_table: bool,
+                               has_list: bool) -> str:
+        """콘텐츠 타입 결정 (감지 결과만으로 우선순위 판단)"""
         if is_empty:
             return "empty"
         elif is_html and has_images and has_attachments:
@@ -191,65 +399,15 @@ class ContentAnalyzer:
             return "image"
         elif has_attachments:
             return "attachment"
-        elif self._detect_code(content):
+        elif has_code:
             return "code"
-        elif self._detect_table(content):
+        elif has_table:
             return "table"
-        elif self._detect_list(content):
+        elif has_list:
             return "list"
         else:
             return "text"
     
-    def _detect_code(self, content: str) -> bool:
-        """코드 콘텐츠 감지"""
-        code_patterns = [
-            r'```[\s\S]*?```',      # 마크다운 코드 블록
-            r'`[^`]+`',             # 인라인 코드
-            r'<code[^>]*>',         # HTML code 태그
-            r'<pre[^>]*>',          # HTML pre 태그
-            r'function\s+\w+\s*\(', # 함수 정의
-            r'class\s+\w+\s*{',     # 클래스 정의
-            r'def\s+\w+\s*\(',      # Python 함수
-            r'#include\s*<',        # C/C++ include
-            r'import\s+\w+',        # Python/Java import
-            r'console\.log\s*\(',   # JavaScript console.log
-        ]
-        
-        for pattern in code_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return True
-        return False
-    
-    def _detect_table(self, content: str) -> bool:
-        """테이블 콘텐츠 감지"""
-        table_patterns = [
-            r'<table[^>]*>',        # HTML table
-            r'\|.*\|.*\|',          # 마크다운 테이블
-            r'<tr[^>]*>',           # HTML table row
-            r'<td[^>]*>',           # HTML table cell
-            r'<th[^>]*>',           # HTML table header
-        ]
-        
-        for pattern in table_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return True
-        return False
-    
-    def _detect_list(self, content: str) -> bool:
-        """리스트 콘텐츠 감지"""
-        list_patterns = [
-            r'<ul[^>]*>',           # HTML unordered list
-            r'<ol[^>]*>',           # HTML ordered list
-            r'<li[^>]*>',           # HTML list item
-            r'^\s*[-*+]\s+',        # 마크다운 unordered list
-            r'^\s*\d+\.\s+',        # 마크다운 ordered list
-        ]
-        
-        for pattern in list_patterns:
-            if re.search(pattern, content, re.MULTILINE | re.IGNORECASE):
-                return True
-        return False
-    
     def _generate_special_keywords(self, content_type: str, is_html: bool, 
                                  has_images: bool, has_attachments: bool, is_empty: bool) -> List[str]:
         """특수 키워드 생성 (각 카테고리당 1개씩)"""
@@ -272,8 +430,7 @@ class ContentAnalyzer:
         if is_empty and self.CONTENT_TYPE_KEYWORDS['empty'] not in keywords:
             keywords.append(self.CONTENT_TYPE_KEYWORDS['empty'])
         
-        # 중복 제거하면서 순서 유지 (이미 중복은 방지했지만 안전장치)
-        return list(dict.fromkeys(keywords))
+        return keywords
     
     def extract_keywords_from_content(self, content: str, max_keywords: int = 10) -> List[str]:
         """콘텐츠에서 키워드 추출 (폴백용)"""
@@ -281,28 +438,24 @@ class ContentAnalyzer:
             return []
         
         try:
-            # 한글, 영문, 숫자만 추출
-            words = re.findall(r'[가-힣a-zA-Z0-9]+', content)
+            # 한글, 영문, 숫자 단어 중 2자 이상 15자 이하만 추출
+            filtered_words = _RE_KEYWORD_CANDIDATE.findall(content)
             
-            # 길이 필터링 (2자 이상 15자 이하)
-            filtered_words = [w for w in words if 2 <= len(w) <= 15]
-            
-            # 빈도수 계산 및 정렬
-            from collections import Counter
+            # 빈도수 계산
             word_counts = Counter(filtered_words)
             
             # 상위 키워드 반환
             top_keywords = [word for word, count in word_counts.most_common(max_keywords)]
             
-            logger.debug(
-                "폴백 키워드 추출 완료",
-                extra_data={
-                    "total_words": len(words),
-                    "filtered_words": len(filtered_words),
-                    "extracted_keywords": len(top_keywords),
-                    "keywords": top_keywords
-                }
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "폴백 키워드 추출 완료",
+                    extra_data={
+                        "filtered_words": len(filtered_words),
+                        "extracted_keywords": len(top_keywords),
+                        "keywords": top_keywords
+                    }
+                )
             
             return top_keywords
             
@@ -320,42 +473,31 @@ class ContentAnalyzer:
         
         cleaned_keywords = []
         
-        # 제외할 구문들
-        skip_phrases = [
-            "이 페이지", "내용이", "매우", "짧고", "의미", "없는", "내용이므로",
-            "키워드를", "추출하기", "어렵습니다", "제공된", "내용만으로는",
-            "다음과", "같은", "추출할", "수", "있습니다", "어려운", "상황"
-        ]
-        
-        skip_phrases_en = [
-            "content", "keywords", "extract", "difficult", "short",
-            "meaningful", "following", "provide", "limited", "based"
-        ]
-        
         for keyword in raw_keywords:
             if not isinstance(keyword, str):
                 continue
                 
             cleaned_keyword = keyword.strip()
+            lowered_keyword = cleaned_keyword.lower()
             
             # 필터링 조건들
             if (len(cleaned_keyword) > 20 or 
                 len(cleaned_keyword) < 2 or
-                any(phrase in cleaned_keyword for phrase in skip_phrases) or
-                any(phrase in cleaned_keyword.lower() for phrase in skip_phrases_en) or
+                _contains_skip_phrase(lowered_keyword) or
                 "." in cleaned_keyword):
                 continue
             
             cleaned_keywords.append(cleaned_keyword)
         
-        logger.debug(
-            "LLM 키워드 정리 완료",
-            extra_data={
-                "raw_count": len(raw_keywords),
-                "cleaned_count": len(cleaned_keywords),
-                "cleaned_keywords": cleaned_keywords
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "LLM 키워드 정리 완료",
+                extra_data={
+                    "raw_count": len(raw_keywords),
+                    "cleaned_count": len(cleaned_keywords),
+                    "cleaned_keywords": cleaned_keywords
+                }
+            )
         
         return cleaned_keywords
 
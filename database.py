@@ -4,23 +4,228 @@
 """
 import os
 import json
+import base64
+from datetime import datetime
+from itertools import groupby
+from collections import Counter
 from contextlib import contextmanager
 from typing import List, Optional, Dict, Any, Tuple, Generator
 from sqlalchemy import (
     create_engine, text, Index, func, and_, or_,
-    event, pool
+    event, pool, update, insert, select, literal, literal_column, case, bindparam
 )
 from sqlalchemy.orm import sessionmaker, Session, selectinload, joinedload
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError, OperationalError, IntegrityError
+from sqlalchemy.pool import QueuePool
 
-from models import Base, Page, PageRelationship, Person, PersonPageRelation
+from models import Base, Page, PageKeyword, PageRelationship, Person, PersonPageRelation, json_dumps, json_loads
 from config import config
 from logging_config import get_logger
 from exceptions import DatabaseError, raise_database_error
 
 logger = get_logger("database")
 
+# 검색용 FTS5 인덱스 (trigram 토크나이저: LIKE '%q%'와 같은 부분 문자열 검색, 3자 이상)
+FTS_MIN_QUERY_LENGTH = 3
+
+PAGES_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+        title, summary, content, keywords,
+        content='pages', content_rowid='rowid', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pages_fts_ai AFTER INSERT ON pages BEGIN
+        INSERT INTO pages_fts(rowid, title, summary, content, keywords)
+        VALUES (new.rowid, new.title, new.summary, new.content, new.keywords);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pages_fts_ad AFTER DELETE ON pages BEGIN
+        INSERT INTO pages_fts(pages_fts, rowid, title, summary, content, keywords)
+        VALUES ('delete', old.rowid, old.title, old.summary, old.content, old.keywords);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pages_fts_au AFTER UPDATE OF title, summary, content, keywords ON pages BEGIN
+        INSERT INTO pages_fts(pages_fts, rowid, title, summary, content, keywords)
+        VALUES ('delete', old.rowid, old.title, old.summary, old.content, old.keywords);
+        INSERT INTO pages_fts(rowid, title, summary, content, keywords)
+        VALUES (new.rowid, new.title, new.summary, new.content, new.keywords);
+    END
+    """,
+)
+
+# 조회/존재 확인용 인덱스
+# - 관계 쌍 조회와 source 조회는 (source, target) 유일 인덱스로 처리 (RELATIONSHIP_PAIR_DDL)
+# - relation_exists는 (person_id, page_id, relation_type) 유일 인덱스만으로 판단 (PERSON_RELATION_UNIQUE_DDL)
+LOOKUP_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_page_relationships_target ON page_relationships(target_page_id)",
+    "CREATE INDEX IF NOT EXISTS idx_person_page_relations_page ON person_page_relations(page_id)",
+    # 페이지 목록 keyset 페이지네이션 (PAGE_SORT_KEY 식과 동일해야 인덱스 사용)
+    "CREATE INDEX IF NOT EXISTS idx_pages_space_modified ON pages(space_key, COALESCE(modified_date, ''), page_id)",
+    "CREATE INDEX IF NOT EXISTS idx_pages_modified ON pages(COALESCE(modified_date, ''), page_id)",
+    # DISTINCT_KEYWORDS_SQL 커버링 인덱스 (content 뒤에 있는 keywords를 읽으려고 본문 오버플로 페이지를 넘기지 않음)
+    "CREATE INDEX IF NOT EXISTS idx_pages_space_keywords ON pages(space_key, keywords) WHERE keywords IS NOT NULL",
+)
+
+# 페이지 관계는 방향이 없으므로 (작은 page_id, 큰 page_id) 순서로만 저장
+# - 기존 DB의 역방향 행은 정방향으로 뒤집고, 같은 쌍이 여러 개면 가장 큰 weight로 하나만 남김
+# - 이후 (source, target) 유일 인덱스로 쌍 조회와 UPSERT를 처리
+RELATIONSHIP_PAIR_DDL = (
+    """
+    UPDATE page_relationships
+    SET source_page_id = target_page_id, target_page_id = source_page_id
+    WHERE source_page_id > target_page_id
+    """,
+    """
+    UPDATE page_relationships
+    SET weight = (
+        SELECT MAX(dup.weight) FROM page_relationships AS dup
+        WHERE dup.source_page_id = page_relationships.source_page_id
+          AND dup.target_page_id = page_relationships.target_page_id
+    )
+    WHERE id IN (
+        SELECT MIN(id) FROM page_relationships
+        GROUP BY source_page_id, target_page_id HAVING COUNT(*) > 1
+    )
+    """,
+    """
+    DELETE FROM page_relationships
+    WHERE id NOT IN (SELECT MIN(id) FROM page_relationships GROUP BY source_page_id, target_page_id)
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_page_relationships_unique_pair ON page_relationships(source_page_id, target_page_id)",
+    "DROP INDEX IF EXISTS idx_page_relationships_pair",
+)
+
+# 인물-페이지 관계는 (인물, 페이지, 관계 유형)마다 하나만 저장
+# - 기존 DB의 중복 관계는 가장 먼저 저장된 행만 남긴 뒤 유일 인덱스 생성
+PERSON_RELATION_UNIQUE_DDL = (
+    """
+    DELETE FROM person_page_relations
+    WHERE id NOT IN (
+        SELECT MIN(id) FROM person_page_relations GROUP BY person_id, page_id, relation_type
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_ppr_unique ON person_page_relations(person_id, page_id, relation_type)",
+    "DROP INDEX IF EXISTS idx_ppr_lookup",
+)
+
+# pages.keywords(JSON 배열)를 page_keywords 역색인으로 동기화하는 트리거 (JSON1 필요)
+# - 형식이 잘못된 keywords는 색인하지 않고, 같은 키워드가 여러 번 있어도 한 행만 저장
+PAGE_KEYWORD_VALUES_SQL = """
+    SELECT {page}.page_id, keyword.value FROM json_each({page}.keywords) AS keyword
+    WHERE json_valid({page}.keywords) AND json_type({page}.keywords) = 'array'
+"""
+
+PAGE_KEYWORDS_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_page_keywords_keyword ON page_keywords(keyword)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS page_keywords_ai AFTER INSERT ON pages
+    WHEN new.keywords IS NOT NULL BEGIN
+        INSERT OR IGNORE INTO page_keywords(page_id, keyword)
+        {PAGE_KEYWORD_VALUES_SQL.format(page="new")};
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS page_keywords_ad AFTER DELETE ON pages BEGIN
+        DELETE FROM page_keywords WHERE page_id = old.page_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS page_keywords_au AFTER UPDATE OF page_id, keywords ON pages BEGIN
+        DELETE FROM page_keywords WHERE page_id = old.page_id;
+        INSERT OR IGNORE INTO page_keywords(page_id, keyword)
+        {PAGE_KEYWORD_VALUES_SQL.format(page="new")};
+    END
+    """,
+)
+
+# 트리거 생성 전에 저장된 페이지의 역색인 초기 구축
+PAGE_KEYWORDS_BACKFILL_SQL = """
+    INSERT OR IGNORE INTO page_keywords(page_id, keyword)
+    SELECT pages.page_id, keyword.value
+    FROM pages, json_each(pages.keywords) AS keyword
+    WHERE pages.keywords IS NOT NULL
+      AND json_valid(pages.keywords)
+      AND json_type(pages.keywords) = 'array'
+"""
+
+# 부모 페이지와 키워드 Jaccard 유사도가 높은 페이지 (page_keywords 역색인으로 겹치는 페이지만 집계)
+RELATED_PAGES_SQL = """
+    WITH parent AS (
+        SELECT keyword FROM page_keywords WHERE page_id = :page_id
+    ),
+    candidates AS (
+        SELECT page_id, COUNT(*) AS common
+        FROM page_keywords
+        WHERE keyword IN (SELECT keyword FROM parent) AND page_id != :page_id
+        GROUP BY page_id
+    ),
+    scored AS (
+        SELECT candidates.page_id,
+               CAST(candidates.common AS REAL) / (
+                   (SELECT COUNT(*) FROM parent)
+                   + (SELECT COUNT(*) FROM page_keywords AS own WHERE own.page_id = candidates.page_id)
+                   - candidates.common
+               ) AS similarity
+        FROM candidates
+    )
+    SELECT page_id, similarity FROM scored
+    WHERE similarity > :min_similarity
+    ORDER BY similarity DESC, page_id
+    LIMIT :limit
+"""
+
+# 페이지 목록 정렬 키 (수정일 최신순, 같은 수정일은 page_id 역순; 수정일 없는 페이지는 마지막)
+PAGE_SORT_KEY = (func.coalesce(Page.modified_date, literal_column("''")), Page.page_id)
+
+# 페이지 삭제 시 관련 관계 행을 함께 삭제하는 트리거
+# (기존 DB 테이블에는 ON DELETE CASCADE를 추가할 수 없어 트리거로 처리)
+PAGE_CASCADE_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS pages_cascade_bd BEFORE DELETE ON pages BEGIN
+        DELETE FROM page_relationships WHERE source_page_id = old.page_id;
+        DELETE FROM page_relationships WHERE target_page_id = old.page_id;
+        DELETE FROM person_page_relations WHERE page_id = old.page_id;
+    END
+    """,
+)
+
+# IN (...) 목록 한 번에 바인딩할 최대 값 개수 (SQLITE_MAX_VARIABLE_NUMBER 대비)
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# JSON1 json_each로 keywords 배열을 펼쳐 중복 없는 키워드 목록을 SQLite 안에서 계산
+# (json_valid/json_type 조건으로 형식이 잘못된 행은 json_each 전에 제외)
+DISTINCT_KEYWORDS_SQL = """
+    SELECT DISTINCT keyword.value
+    FROM pages, json_each(pages.keywords) AS keyword
+    WHERE pages.keywords IS NOT NULL
+      AND json_valid(pages.keywords)
+      AND json_type(pages.keywords) = 'array'
+"""
+
+# 호출 빈도가 높은 단건 조회문은 모듈 로드 시 한 번만 구성하고 값은 바인드 파라미터로 전달
+# (동일한 statement 객체를 재사용하므로 엔진의 컴파일 캐시에서 바로 SQL을 찾음)
+SELECT_PAGE_BY_ID = select(Page).where(Page.page_id == bindparam("page_id"))
+SELECT_PAGE_EXISTS = (
+    select(literal(1)).select_from(Page)
+    .where(Page.page_id == bindparam("page_id")).limit(1)
+)
+SELECT_PAGE_MODIFIED_DATE = (
+    select(Page.modified_date).where(Page.page_id == bindparam("page_id")).limit(1)
+)
+SELECT_PERSON_BY_NAME = select(Person).where(Person.name == bindparam("name")).limit(1)
+SELECT_RELATION_EXISTS = (
+    select(literal(1)).select_from(PersonPageRelation).where(
+        PersonPageRelation.person_id == bindparam("person_id"),
+        PersonPageRelation.page_id == bindparam("page_id"),
+        PersonPageRelation.relation_type == bindparam("relation_type")
+    ).limit(1)
+)
+
 
 class OptimizedDatabaseManager:
     """성능 최적화된 데이터베이스 매니저"""
@@ -28,9 +233,16 @@ class OptimizedDatabaseManager:
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
+        self.fts_enabled = False
+        self.person_upsert_enabled = False
+        self.relationship_upsert_enabled = False
+        self.person_relation_unique_enabled = False
+        self.page_keywords_enabled = False
+        # 페이지 변경 시 증가하는 데이터 버전 (조회 결과 캐시 무효화용)
+        self._data_version = 0
+        self._query_cache: Dict[str, Tuple[int, Any]] = {}
         self._setup_database()
         self._setup_indexes()
-        self._setup_event_listeners()
         
     def _setup_database(self):
         """데이터베이스 설정 및 연결"""
@@ -44,20 +256,26 @@ class OptimizedDatabaseManager:
             sqlite_url = f"sqlite:///{config.DATABASE_PATH}"
             
             # 성능 최적화를 위한 엔진 설정
+            # (WAL 모드에서 읽기가 쓰기를 기다리지 않도록 연결 풀 사용, 트랜잭션은 SQLAlchemy가 관리)
             self.engine = create_engine(
                 sqlite_url,
-                poolclass=StaticPool,
-                pool_pre_ping=True,
+                poolclass=QueuePool,
+                pool_size=5,
+                max_overflow=10,
+                pool_timeout=30,
+                pool_use_lifo=True,  # 최근 사용한 연결 재사용 (페이지 캐시가 채워진 연결 우선)
                 pool_recycle=300,
+                query_cache_size=1200,  # 컴파일된 SQL 캐시 크기 (기본 500)
                 connect_args={
                     "check_same_thread": False,
-                    "timeout": 30,
-                    # SQLite 성능 최적화 설정
-                    "isolation_level": None,  # autocommit 모드
+                    "timeout": 30,  # 쓰기 잠금 대기 시간 (초)
                 },
                 echo=config.DEBUG if hasattr(config, 'DEBUG') else False
             )
             
+            # 첫 연결(테이블 생성)부터 PRAGMA가 적용되도록 엔진 생성 직후 리스너 등록
+            self._setup_event_listeners()
+            
             # 세션 팩토리 생성
             self.SessionLocal = sessionmaker(
                 autocommit=False,
@@ -79,12 +297,9 @@ class OptimizedDatabaseManager:
         """성능 최적화를 위한 인덱스 생성"""
         try:
             with self.get_session() as session:
-                # SQLite 성능 최적화 설정
+                # 연결별 PRAGMA는 connect 이벤트에서 설정 (_setup_event_listeners)
+                # journal_mode=WAL은 데이터베이스 파일에 유지되므로 한 번만 설정
                 session.execute(text("PRAGMA journal_mode=WAL"))  # Write-Ahead Logging
-                session.execute(text("PRAGMA synchronous=NORMAL"))  # 성능과 안정성 균형
-                session.execute(text("PRAGMA cache_size=10000"))  # 캐시 크기 증가
-                session.execute(text("PRAGMA temp_store=memory"))  # 임시 저장소를 메모리에
-                session.execute(text("PRAGMA mmap_size=268435456"))  # 256MB 메모리 맵
                 
                 # space_key 컬럼이 없는 경우 추가
                 try:
@@ -95,6 +310,25 @@ class OptimizedDatabaseManager:
                     session.commit()
                     logger.info("space_key 컬럼 추가 완료")
                 
+                # 조회용 인덱스 및 페이지 삭제 연쇄 처리 트리거
+                for ddl in LOOKUP_INDEX_DDL + PAGE_CASCADE_DDL:
+                    session.execute(text(ddl))
+                
+                # 페이지 관계 쌍 정규화 및 유일 인덱스 (create_relationship UPSERT용)
+                self._setup_relationship_pair_index(session)
+                
+                # 인물-페이지 관계 유일 인덱스 (create_person_page_relation 중복 무시용)
+                self._setup_person_relation_index(session)
+                
+                # 인물 이름 유일 인덱스 (find_or_create_person UPSERT용)
+                self._setup_person_name_index(session)
+                
+                # 키워드 역색인 (page_keywords)
+                self._setup_page_keywords(session)
+                
+                # 전문 검색 인덱스 (FTS5)
+                self._setup_fulltext_search(session)
+                
                 # 추가 인덱스가 필요한 경우 여기에 추가
                 # 예: session.execute(text("CREATE INDEX IF NOT EXISTS idx_custom ON pages(column)"))
                 
@@ -105,6 +339,128 @@ class OptimizedDatabaseManager:
         except Exception as e:
             logger.error("인덱스 설정 실패", extra_data={"error": str(e)})
     
+    def _setup_fulltext_search(self, session: Session):
+        """FTS5 검색 테이블과 동기화 트리거 생성 (FTS5 미지원 시 LIKE 검색 유지)"""
+        try:
+            fts_exists = session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pages_fts'"
+            )).first() is not None
+            
+            for ddl in PAGES_FTS_DDL:
+                session.execute(text(ddl))
+            
+            if not fts_exists:
+                # 기존 페이지로 인덱스 초기 구축
+                session.execute(text("INSERT INTO pages_fts(pages_fts) VALUES ('rebuild')"))
+            
+            self.fts_enabled = True
+        except OperationalError as e:
+            logger.warning("FTS5 검색 인덱스를 사용할 수 없어 LIKE 검색을 사용합니다", extra_data={"error": str(e)})
+    
+    def _setup_page_keywords(self, session: Session):
+        """page_keywords 동기화 트리거 생성 (JSON1 미지원 시 관련 페이지를 Python에서 계산)"""
+        try:
+            triggers_exist = session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'page_keywords_ai'"
+            )).first() is not None
+            
+            for ddl in PAGE_KEYWORDS_DDL:
+                session.execute(text(ddl))
+            
+            if not triggers_exist:
+                # 트리거 생성 전에 저장된 페이지로 역색인 초기 구축
+                session.execute(text("DELETE FROM page_keywords"))
+                session.execute(text(PAGE_KEYWORDS_BACKFILL_SQL))
+            
+            self.page_keywords_enabled = True
+        except OperationalError as e:
+            logger.warning("키워드 역색인을 사용할 수 없어 관련 페이지를 Python에서 계산합니다", extra_data={"error": str(e)})
+    
+    def _setup_relationship_pair_index(self, session: Session):
+        """기존 관계를 정방향 쌍으로 정리한 뒤 (source, target) 유일 인덱스 생성 (최초 1회)"""
+        index_exists = session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_page_relationships_unique_pair'"
+        )).first() is not None
+        
+        if not index_exists:
+            for ddl in RELATIONSHIP_PAIR_DDL:
+                session.execute(text(ddl))
+            logger.info("페이지 관계 쌍 정규화 완료")
+        
+        self.relationship_upsert_enabled = True
+    
+    def _setup_person_relation_index(self, session: Session):
+        """중복 인물-페이지 관계 정리 후 (person_id, page_id, relation_type) 유일 인덱스 생성 (최초 1회)"""
+        index_exists = session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_ppr_unique'"
+        )).first() is not None
+        
+        if not index_exists:
+            for ddl in PERSON_RELATION_UNIQUE_DDL:
+                session.execute(text(ddl))
+            logger.info("인물-페이지 관계 중복 정리 완료")
+        
+        self.person_relation_unique_enabled = True
+    
+    def _setup_person_name_index(self, session: Session):
+        """persons.name 유일 인덱스 생성 (기존 DB에 중복 이름이 있으면 조회 후 생성 방식 유지)"""
+        try:
+            session.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS idx_persons_name ON persons(name)"))
+            self.person_upsert_enabled = True
+        except IntegrityError as e:
+            logger.warning("중복된 인물 이름이 있어 UPSERT를 사용하지 않습니다", extra_data={"error": str(e)})
+    
+    def _apply_search_filters(self, q, query: Optional[str], keywords: Optional[List[str]],
+                              rank_by_relevance: bool = False):
+        """
+        검색어/키워드 조건 적용 (3자 이상은 FTS5 MATCH, 그 외는 LIKE)
+        
+        rank_by_relevance이면 FTS5 검색 결과를 bm25 점수(관련도 높은 순)로 정렬합니다.
+        """
+        match_terms = []
+        
+        # 텍스트 검색
+        if query:
+            if self.fts_enabled and len(query) >= FTS_MIN_QUERY_LENGTH:
+                match_terms.append(f'{{title summary content}} : {self._fts_phrase(query)}')
+            else:
+                # %, _ 는 와일드카드가 아닌 문자로 검색 (FTS5 경로와 같은 의미)
+                q = q.filter(or_(
+                    Page.title.contains(query, autoescape=True),
+                    Page.summary.contains(query, autoescape=True),
+                    Page.content.contains(query, autoescape=True)
+                ))
+        
+        # 키워드 검색
+        if keywords:
+            for keyword in keywords:
+                if self.fts_enabled and len(keyword) >= FTS_MIN_QUERY_LENGTH:
+                    match_terms.append(f'keywords : {self._fts_phrase(keyword)}')
+                else:
+                    q = q.filter(Page.keywords.contains(keyword, autoescape=True))
+        
+        if match_terms:
+            match_clause = text("pages_fts MATCH :fts_query").bindparams(fts_query=" AND ".join(match_terms))
+            if rank_by_relevance:
+                # MATCH와 bm25 점수 계산은 FTS 서브쿼리에서 먼저 수행한 뒤 rowid로 pages와 조인
+                hits = select(
+                    literal_column("pages_fts.rowid").label("fts_rowid"),
+                    literal_column("bm25(pages_fts)").label("score")
+                ).select_from(text("pages_fts")).where(match_clause).subquery("fts_hits")
+                q = q.join(hits, literal_column("pages.rowid") == hits.c.fts_rowid)\
+                    .order_by(hits.c.score, Page.page_id)
+            else:
+                q = q.filter(literal_column("pages.rowid").in_(
+                    select(literal_column("rowid")).select_from(text("pages_fts")).where(match_clause)
+                ))
+        
+        return q
+    
+    @staticmethod
+    def _fts_phrase(term: str) -> str:
+        """FTS5 문자열(phrase)로 인용 (trigram에서는 부분 문자열 매칭)"""
+        return '"' + term.replace('"', '""') + '"'
+    
     def _setup_event_listeners(self):
         """SQLAlchemy 이벤트 리스너 설정"""
         @event.listens_for(self.engine, "connect")
@@ -113,7 +469,47 @@ class OptimizedDatabaseManager:
             cursor = dbapi_connection.cursor()
             # 외래 키 제약 조건 활성화
             cursor.execute("PRAGMA foreign_keys=ON")
+            # 본문이 긴 페이지가 많으므로 8KB 페이지 사용 (새 DB에만 적용, 기존 DB는 VACUUM 전까지 유지)
+            cursor.execute("PRAGMA page_size=8192")
+            # 삭제로 생긴 빈 페이지를 파일 재작성 없이 회수할 수 있도록 증분 auto_vacuum 사용
+            # (새 DB는 테이블 생성 전에 적용되고, 기존 DB는 다음 vacuum_database() 실행 시 전환됨)
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            # SQLite 성능 최적화 설정 (연결 단위 설정이므로 풀의 모든 연결에 적용)
+            cursor.execute("PRAGMA synchronous=NORMAL")  # 성능과 안정성 균형
+            cursor.execute("PRAGMA cache_size=-65536")  # 페이지 캐시 64MB
+            cursor.execute("PRAGMA temp_store=MEMORY")  # 임시 저장소를 메모리에
+            cursor.execute("PRAGMA mmap_size=268435456")  # 256MB 메모리 맵
+            cursor.execute("PRAGMA wal_autocheckpoint=1000")  # WAL 1000페이지마다 체크포인트
             cursor.close()
+        
+        @event.listens_for(self.engine, "close")
+        def optimize_on_close(dbapi_connection, connection_record):
+            """연결 종료 시 쿼리 플래너 통계 갱신 (필요한 테이블만 ANALYZE)"""
+            try:
+                dbapi_connection.execute("PRAGMA optimize")
+            except Exception:
+                pass
+    
+    def _invalidate_cache(self):
+        """페이지 데이터 변경 후 조회 결과 캐시 무효화"""
+        self._data_version += 1
+    
+    @staticmethod
+    def _mark_pages_changed(session: Session):
+        """세션 커밋 후 캐시를 무효화하도록 표시 (커밋 전에 무효화하면 이전 데이터가 새 버전으로 캐시될 수 있음)"""
+        session.info["pages_changed"] = True
+    
+    def _get_cached(self, key: str) -> Optional[Any]:
+        """현재 데이터 버전에서 계산된 캐시 결과 조회 (없으면 None)"""
+        cached = self._query_cache.get(key)
+        if cached is not None and cached[0] == self._data_version:
+            value = cached[1]
+            return list(value) if isinstance(value, list) else value
+        return None
+    
+    def _set_cached(self, key: str, version: int, value: Any):
+        """조회 시작 시점의 데이터 버전으로 결과 저장 (조회 중 변경되면 다음 호출에서 재계산)"""
+        self._query_cache[key] = (version, value)
     
     @contextmanager
     def get_session(self) -> Generator[Session, None, None]:
@@ -122,6 +518,8 @@ class OptimizedDatabaseManager:
         try:
             yield session
             session.commit()
+            if session.info.get("pages_changed"):
+                self._invalidate_cache()
         except Exception as e:
             session.rollback()
             logger.error("데이터베이스 트랜잭션 실패", extra_data={"error": str(e)})
@@ -135,8 +533,8 @@ class OptimizedDatabaseManager:
             try:
                 page = Page(**page_data)
                 session.add(page)
-                session.flush()  # ID 생성을 위해
-                session.refresh(page)
+                session.flush()  # 무결성 오류를 이 블록에서 처리하기 위해 즉시 INSERT
+                self._mark_pages_changed(session)
                 
                 logger.debug(
                     "페이지 생성 완료",
@@ -165,12 +563,11 @@ class OptimizedDatabaseManager:
         
         with self.get_session() as session:
             try:
+                # unit-of-work/refresh 없이 ORM bulk INSERT (executemany) 한 번으로 저장
+                # (page_id는 호출자가 지정하고 서버 기본값이 없어 저장 후 다시 읽을 필요 없음)
+                session.execute(insert(Page), pages_data)
                 pages = [Page(**data) for data in pages_data]
-                session.add_all(pages)
-                session.flush()
-                
-                for page in pages:
-                    session.refresh(page)
+                self._mark_pages_changed(session)
                 
                 logger.info(
                     "페이지 배치 생성 완료",
@@ -193,13 +590,9 @@ class OptimizedDatabaseManager:
         """페이지 조회 (최적화)"""
         with self.get_session() as session:
             try:
-                page = session.query(Page).filter(Page.page_id == page_id).first()
-                
-                if page:
-                    # 관련 데이터를 미리 로드
-                    session.refresh(page)
-                
-                return page
+                return session.execute(
+                    SELECT_PAGE_BY_ID, {"page_id": page_id}
+                ).scalar_one_or_none()
                 
             except SQLAlchemyError as e:
                 logger.error(
@@ -218,9 +611,12 @@ class OptimizedDatabaseManager:
         
         with self.get_session() as session:
             try:
-                pages = session.query(Page).filter(
-                    Page.page_id.in_(page_ids)
-                ).all()
+                pages = []
+                for start in range(0, len(page_ids), IN_CLAUSE_CHUNK_SIZE):
+                    chunk = page_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+                    pages.extend(
+                        session.query(Page).filter(Page.page_id.in_(chunk)).all()
+                    )
                 
                 logger.debug(
                     "페이지 배치 조회 완료",
@@ -251,6 +647,8 @@ class OptimizedDatabaseManager:
                 ).update(updates)
                 
                 success = result > 0
+                if success:
+                    self._mark_pages_changed(session)
                 
                 if success:
                     logger.debug(
@@ -287,12 +685,22 @@ class OptimizedDatabaseManager:
         with self.get_session() as session:
             try:
                 updated_count = 0
+                pages_table = Page.__table__
+                connection = session.connection()
+                
+                # 수정 컬럼 구성이 같은 연속 항목끼리 하나의 UPDATE 문으로 executemany 실행
+                # (연속 구간 단위로 묶어 같은 페이지에 대한 수정 순서 유지)
+                for columns, group in groupby(updates, key=lambda item: tuple(item[1])):
+                    if not columns:
+                        continue
+                    stmt = update(pages_table).where(
+                        pages_table.c.page_id == bindparam("_page_id")
+                    ).values({column: bindparam(column) for column in columns})
+                    params = [{"_page_id": page_id, **update_data} for page_id, update_data in group]
+                    updated_count += connection.execute(stmt, params).rowcount
                 
-                for page_id, update_data in updates:
-                    result = session.query(Page).filter(
-                        Page.page_id == page_id
-                    ).update(update_data)
-                    updated_count += result
+                if updated_count:
+                    self._mark_pages_changed(session)
                 
                 logger.info(
                     "페이지 배치 업데이트 완료",
@@ -314,16 +722,111 @@ class OptimizedDatabaseManager:
                 )
                 return 0
     
-    def get_all_pages(self, offset: int = 0, limit: int = 100) -> List[Page]:
-        """모든 페이지 조회 (페이징)"""
+    def get_pages_by_parent(self, parent_page_id: str, min_similarity: float = 0.1,
+                            limit: int = 20) -> List[Page]:
+        """
+        부모 페이지와 키워드가 비슷한 페이지 조회 (Jaccard 유사도 내림차순, 부모 페이지 제외)
+        
+        page_keywords 역색인에서 부모와 키워드가 하나 이상 겹치는 페이지만 집계하므로
+        전체 페이지를 읽지 않습니다. 역색인을 쓸 수 없으면 Python에서 계산합니다.
+        """
         with self.get_session() as session:
             try:
-                pages = session.query(Page).offset(offset).limit(limit).all()
+                if self.page_keywords_enabled:
+                    rows = session.execute(text(RELATED_PAGES_SQL), {
+                        "page_id": parent_page_id,
+                        "min_similarity": min_similarity,
+                        "limit": limit
+                    }).all()
+                else:
+                    rows = self._related_pages_fallback(session, parent_page_id, min_similarity, limit)
+                
+                page_ids = [page_id for page_id, _ in rows]
+                pages_by_id = {
+                    page.page_id: page
+                    for page in session.query(Page).filter(Page.page_id.in_(page_ids)).all()
+                } if page_ids else {}
+                
+                logger.debug(
+                    "관련 페이지 조회 완료",
+                    extra_data={
+                        "parent_page_id": parent_page_id,
+                        "found": len(page_ids)
+                    }
+                )
+                
+                return [pages_by_id[page_id] for page_id in page_ids if page_id in pages_by_id]
+                
+            except SQLAlchemyError as e:
+                logger.error(
+                    "관련 페이지 조회 실패",
+                    extra_data={
+                        "parent_page_id": parent_page_id,
+                        "error": str(e)
+                    }
+                )
+                return []
+    
+    def _related_pages_fallback(self, session: Session, parent_page_id: str, min_similarity: float,
+                                limit: int) -> List[Tuple[str, float]]:
+        """키워드 역색인 없이 keywords 컬럼을 스트리밍하며 Jaccard 유사도 계산"""
+        parent_keywords_json = session.execute(
+            select(Page.keywords).where(Page.page_id == parent_page_id)
+        ).scalar()
+        parent_keywords = self._keyword_set(parent_keywords_json)
+        if not parent_keywords:
+            return []
+        
+        scores = []
+        rows = session.query(Page.page_id, Page.keywords)\
+            .filter(Page.keywords.isnot(None), Page.page_id != parent_page_id)\
+            .yield_per(1000)
+        for page_id, keywords_json in rows:
+            keywords = self._keyword_set(keywords_json)
+            common = len(parent_keywords & keywords)
+            if common:
+                similarity = common / len(parent_keywords | keywords)
+                if similarity > min_similarity:
+                    scores.append((page_id, similarity))
+        
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores[:limit]
+    
+    @staticmethod
+    def _keyword_set(keywords_json: Optional[str]) -> set:
+        """keywords JSON 배열을 집합으로 변환 (배열이 아니거나 형식이 잘못되면 빈 집합)"""
+        try:
+            keywords = json_loads(keywords_json) if keywords_json else None
+        except (ValueError, TypeError):
+            return set()
+        return set(keywords) if isinstance(keywords, list) else set()
+    
+    def get_all_pages(self, offset: int = 0, limit: int = 100,
+                      cursor: Optional[str] = None) -> List[Page]:
+        """
+        모든 페이지 조회 (수정일 최신순, 페이징)
+        
+        cursor(page_cursor()로 만든 이전 목록의 마지막 행 커서)를 주면 offset 대신
+        keyset 방식으로 다음 행부터 조회합니다.
+        """
+        with self.get_session() as session:
+            try:
+                query = session.query(Page)
+                last_key = self._decode_page_cursor(cursor) if cursor else None
+                if last_key is not None:
+                    query = self._after_page_key(query, last_key)
+                    offset = 0
+                
+                pages = query.order_by(*(key.desc() for key in PAGE_SORT_KEY))\
+                    .offset(offset)\
+                    .limit(limit)\
+                    .all()
                 
                 logger.debug(
                     "페이지 목록 조회 완료",
                     extra_data={
                         "offset": offset,
+                        "cursor": cursor,
                         "limit": limit,
                         "count": len(pages)
                     }
@@ -343,22 +846,7 @@ class OptimizedDatabaseManager:
         """페이지 검색 (최적화)"""
         with self.get_session() as session:
             try:
-                q = session.query(Page)
-                
-                # 텍스트 검색
-                if query:
-                    search_term = f"%{query}%"
-                    q = q.filter(or_(
-                        Page.title.like(search_term),
-                        Page.summary.like(search_term),
-                        Page.content.like(search_term)
-                    ))
-                
-                # 키워드 검색
-                if keywords:
-                    for keyword in keywords:
-                        keyword_term = f"%{keyword}%"
-                        q = q.filter(Page.keywords.like(keyword_term))
+                q = self._apply_search_filters(session.query(Page), query, keywords, rank_by_relevance=True)
                 
                 pages = q.offset(offset).limit(limit).all()
                 
@@ -385,11 +873,17 @@ class OptimizedDatabaseManager:
                 return []
     
     def count_pages(self) -> int:
-        """총 페이지 수 조회"""
+        """총 페이지 수 조회 (페이지 변경 전까지 결과 캐시)"""
+        cached = self._get_cached("page_count")
+        if cached is not None:
+            return cached
+        
+        version = self._data_version
         with self.get_session() as session:
             try:
-                count = session.query(func.count(Page.page_id)).scalar()
-                return count or 0
+                count = session.query(func.count(Page.page_id)).scalar() or 0
+                self._set_cached("page_count", version, count)
+                return count
             except SQLAlchemyError as e:
                 logger.error("페이지 수 조회 실패", extra_data={"error": str(e)})
                 return 0
@@ -398,20 +892,9 @@ class OptimizedDatabaseManager:
         """검색 결과 페이지 수 조회"""
         with self.get_session() as session:
             try:
-                q = session.query(func.count(Page.page_id))
-                
-                if query:
-                    search_term = f"%{query}%"
-                    q = q.filter(or_(
-                        Page.title.like(search_term),
-                        Page.summary.like(search_term),
-                        Page.content.like(search_term)
-                    ))
-                
-                if keywords:
-                    for keyword in keywords:
-                        keyword_term = f"%{keyword}%"
-                        q = q.filter(Page.keywords.like(keyword_term))
+                q = self._apply_search_filters(
+                    session.query(func.count(Page.page_id)), query, keywords
+                )
                 
                 count = q.scalar()
                 return count or 0
@@ -441,24 +924,17 @@ class OptimizedDatabaseManager:
                 return []
     
     def get_all_keywords(self) -> List[str]:
-        """모든 키워드 목록 조회 (최적화)"""
+        """모든 키워드 목록 조회 (페이지 변경 전까지 결과 캐시)"""
+        cached = self._get_cached("all_keywords")
+        if cached is not None:
+            return cached
+        
+        version = self._data_version
         with self.get_session() as session:
             try:
-                # 모든 페이지의 키워드를 한 번에 가져와서 처리
-                results = session.query(Page.keywords).filter(
-                    Page.keywords.isnot(None)
-                ).all()
-                
-                all_keywords = set()
-                for (keywords_json,) in results:
-                    try:
-                        keywords = json.loads(keywords_json)
-                        if isinstance(keywords, list):
-                            all_keywords.update(keywords)
-                    except (json.JSONDecodeError, TypeError):
-                        continue
-                
-                return sorted(list(all_keywords))
+                keywords = self._load_all_keywords(session)
+                self._set_cached("all_keywords", version, keywords)
+                return list(keywords)
                 
             except SQLAlchemyError as e:
                 logger.error(
@@ -467,14 +943,96 @@ class OptimizedDatabaseManager:
                 )
                 return []
     
+    def _load_all_keywords(self, session: Session) -> List[str]:
+        """모든 키워드 목록 계산 (JSON1 우선, 미지원 시 Python 집계)"""
+        try:
+            return self._distinct_keywords(session)
+        except OperationalError:
+            # JSON1을 사용할 수 없는 SQLite 빌드에서는 Python에서 집계
+            pass
+        
+        # keywords 컬럼만 스트리밍으로 조회 (전체 결과를 리스트로 만들지 않음)
+        results = session.query(Page.keywords).filter(
+            Page.keywords.isnot(None)
+        ).yield_per(1000)
+        
+        all_keywords = set()
+        for (keywords_json,) in results:
+            try:
+                keywords = json_loads(keywords_json)
+                if isinstance(keywords, list):
+                    all_keywords.update(keywords)
+            except (json.JSONDecodeError, TypeError):
+                continue
+        
+        return sorted(list(all_keywords))
+    
+    def _distinct_keywords(self, session: Session, space_key: Optional[str] = None) -> List[str]:
+        """중복 없는 키워드 목록을 정렬해 조회 (JSON1 미지원 시 OperationalError)"""
+        sql = DISTINCT_KEYWORDS_SQL
+        params = {}
+        if space_key is not None:
+            sql += " AND pages.space_key = :space_key"
+            params["space_key"] = space_key
+        
+        rows = session.execute(text(sql + " ORDER BY keyword.value"), params)
+        return [keyword for (keyword,) in rows]
+
+    def get_keyword_counts(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """키워드별 등장 페이지 수를 많은 순으로 조회 (페이지 변경 전까지 결과 캐시)"""
+        cache_key = f"keyword_counts:{limit}"
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        version = self._data_version
+        with self.get_session() as session:
+            try:
+                if self.page_keywords_enabled:
+                    # page_keywords 역색인의 keyword 인덱스만 읽어 SQLite 안에서 집계
+                    page_count = func.count().label("page_count")
+                    query = session.query(
+                        PageKeyword.keyword, page_count
+                    ).group_by(PageKeyword.keyword).order_by(
+                        page_count.desc(), PageKeyword.keyword
+                    )
+                    if limit is not None:
+                        query = query.limit(limit)
+                    counts = [(keyword, count) for keyword, count in query]
+                else:
+                    counts = self._count_keywords_fallback(session, limit)
+
+                self._set_cached(cache_key, version, counts)
+                return list(counts)
+
+            except SQLAlchemyError as e:
+                logger.error(
+                    "키워드 빈도 조회 실패",
+                    extra_data={"error": str(e)}
+                )
+                return []
+
+    def _count_keywords_fallback(self, session: Session, limit: Optional[int]) -> List[Tuple[str, int]]:
+        """page_keywords를 쓸 수 없을 때 keywords 컬럼을 스트리밍하며 Counter로 집계"""
+        results = session.query(Page.keywords).filter(
+            Page.keywords.isnot(None)
+        ).yield_per(1000)
+
+        counter = Counter(
+            keyword
+            for (keywords_json,) in results
+            for keyword in self._keyword_set(keywords_json)
+        )
+        return counter.most_common(limit)
+
     def page_exists(self, page_id: str) -> bool:
         """페이지 존재 여부 확인 (최적화)"""
         with self.get_session() as session:
             try:
-                exists = session.query(
-                    session.query(Page).filter(Page.page_id == page_id).exists()
+                exists = session.execute(
+                    SELECT_PAGE_EXISTS, {"page_id": page_id}
                 ).scalar()
-                return bool(exists)
+                return exists is not None
                 
             except SQLAlchemyError as e:
                 logger.error(
@@ -490,11 +1048,9 @@ class OptimizedDatabaseManager:
         """페이지 수정일 조회 (최적화)"""
         with self.get_session() as session:
             try:
-                result = session.query(Page.modified_date).filter(
-                    Page.page_id == page_id
-                ).first()
-                
-                return result[0] if result else None
+                return session.execute(
+                    SELECT_PAGE_MODIFIED_DATE, {"page_id": page_id}
+                ).scalar()
                 
             except SQLAlchemyError as e:
                 logger.error(
@@ -506,24 +1062,44 @@ class OptimizedDatabaseManager:
                 )
                 return None
     
+    def get_pages_modified_dates(self, page_ids: List[str]) -> Dict[str, Optional[str]]:
+        """여러 페이지의 수정일을 한 번에 조회 (DB에 없는 페이지는 결과에서 제외)"""
+        if not page_ids:
+            return {}
+        
+        with self.get_session() as session:
+            try:
+                modified_dates = {}
+                for start in range(0, len(page_ids), IN_CLAUSE_CHUNK_SIZE):
+                    chunk = page_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+                    modified_dates.update(session.execute(
+                        select(Page.page_id, Page.modified_date).where(Page.page_id.in_(chunk))
+                    ).all())
+                
+                return modified_dates
+                
+            except SQLAlchemyError as e:
+                logger.error(
+                    "페이지 수정일 배치 조회 실패",
+                    extra_data={
+                        "count": len(page_ids),
+                        "error": str(e)
+                    }
+                )
+                return {}
+    
     def delete_page(self, page_id: str) -> bool:
         """페이지 삭제"""
         with self.get_session() as session:
             try:
-                # 먼저 관련 관계 삭제
-                session.query(PageRelationship).filter(
-                    or_(
-                        PageRelationship.source_page_id == page_id,
-                        PageRelationship.target_page_id == page_id
-                    )
-                ).delete(synchronize_session=False)
-                
-                # 페이지 삭제
+                # 페이지 삭제 (관련 관계는 pages_cascade_bd 트리거가 함께 삭제)
                 result = session.query(Page).filter(
                     Page.page_id == page_id
                 ).delete(synchronize_session=False)
                 
                 success = result > 0
+                if success:
+                    self._mark_pages_changed(session)
                 
                 if success:
                     logger.info(
@@ -544,11 +1120,22 @@ class OptimizedDatabaseManager:
                 return False
     
     def vacuum_database(self):
-        """데이터베이스 최적화 (VACUUM)"""
+        """데이터베이스 최적화 (VACUUM)
+        
+        파일 전체를 다시 쓰고 그동안 배타적 잠금을 잡으므로 가끔만 수동으로 실행합니다.
+        평소 유지보수는 연결 종료 시 PRAGMA optimize와 incremental_vacuum()으로 충분합니다.
+        """
         try:
             with self.engine.connect() as connection:
                 connection.execute(text("VACUUM"))
                 connection.execute(text("ANALYZE"))
+                if self.fts_enabled:
+                    # VACUUM은 pages의 rowid를 다시 매길 수 있으므로 외부 콘텐츠 FTS 인덱스 재구축
+                    connection.execute(text("INSERT INTO pages_fts(pages_fts) VALUES ('rebuild')"))
+                connection.commit()
+                
+                # WAL 모드의 VACUUM은 DB 전체를 WAL에 기록하므로 체크포인트 후 WAL 파일을 비움
+                connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
             
             logger.info("데이터베이스 VACUUM 완료")
             
@@ -558,20 +1145,45 @@ class OptimizedDatabaseManager:
                 extra_data={"error": str(e)}
             )
     
+    def incremental_vacuum(self, max_pages: int = 1000):
+        """빈 페이지를 최대 max_pages개까지 회수 (auto_vacuum=INCREMENTAL 필요, 파일 전체 재작성 없음)"""
+        raw_connection = self.engine.raw_connection()
+        try:
+            # PRAGMA incremental_vacuum은 끝까지 step해야 모든 페이지가 회수되므로 executescript 사용
+            raw_connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({int(max_pages)})"
+            )
+            logger.debug("증분 VACUUM 완료", extra_data={"max_pages": max_pages})
+            
+        except Exception as e:
+            logger.error(
+                "증분 VACUUM 실패",
+                extra_data={"max_pages": max_pages, "error": str(e)}
+            )
+        finally:
+            raw_connection.close()
+    
     def get_database_stats(self) -> Dict[str, Any]:
         """데이터베이스 통계 정보 조회"""
         with self.get_session() as session:
             try:
                 stats = {
-                    "total_pages": session.query(func.count(Page.page_id)).scalar() or 0,
-                    "total_relationships": session.query(func.count(PageRelationship.id)).scalar() or 0,
+                    # 페이지 수는 count_pages 캐시 재사용 (페이지 변경 시에만 다시 COUNT)
+                    "total_pages": self.count_pages(),
+                    "total_relationships": session.execute(
+                        select(func.count(PageRelationship.id))
+                    ).scalar() or 0,
                 }
                 
-                # 데이터베이스 파일 크기
-                if os.path.exists(config.DATABASE_PATH):
-                    stats["db_size_mb"] = round(
-                        os.path.getsize(config.DATABASE_PATH) / (1024 * 1024), 2
-                    )
+                # 데이터베이스 크기 (WAL 모드에서는 파일 크기에 -wal 파일 내용이 빠지므로 PRAGMA로 계산)
+                page_count = session.execute(text("PRAGMA page_count")).scalar() or 0
+                page_size = session.execute(text("PRAGMA page_size")).scalar() or 0
+                stats["db_size_mb"] = round(page_count * page_size / (1024 * 1024), 2)
+                
+                # 아직 체크포인트되지 않은 WAL 파일 크기 (디스크 사용량 참고용)
+                wal_path = f"{config.DATABASE_PATH}-wal"
+                if os.path.exists(wal_path):
+                    stats["wal_size_mb"] = round(os.path.getsize(wal_path) / (1024 * 1024), 2)
                 
                 return stats
                 
@@ -602,13 +1214,16 @@ class OptimizedDatabaseManager:
         """이름으로 인물 조회"""
         with self.get_session() as session:
             try:
-                return session.query(Person).filter(Person.name == name).first()
+                return session.scalars(SELECT_PERSON_BY_NAME, {"name": name}).first()
             except SQLAlchemyError as e:
                 logger.error("인물 이름 조회 실패", extra_data={"name": name, "error": str(e)})
                 return None
     
     def find_or_create_person(self, name: str, email: str = None, department: str = None, role: str = None) -> Person:
         """인물 찾기 또는 생성 (중복 방지)"""
+        if self.person_upsert_enabled:
+            return self._upsert_person(name, email, department, role)
+        
         with self.get_session() as session:
             try:
                 # 이름으로 먼저 찾기
@@ -651,6 +1266,50 @@ class OptimizedDatabaseManager:
                 logger.error("인물 찾기/생성 실패", extra_data={"name": name, "error": str(e)})
                 raise_database_error("인물 처리 실패", {"name": name, "error": str(e)})
     
+    def _upsert_person(self, name: str, email: str, department: str, role: str) -> Person:
+        """
+        INSERT ... ON CONFLICT(name) DO UPDATE 한 문장으로 인물 찾기/생성
+        
+        기존 인물은 비어 있는 email/department/role만 채우고, 채운 값이 있을 때만 updated_at을 갱신합니다.
+        """
+        with self.get_session() as session:
+            try:
+                now = datetime.utcnow()
+                stmt = sqlite_insert(Person).values(
+                    name=name,
+                    email=email,
+                    department=department,
+                    role=role,
+                    mentioned_count=0,
+                    created_at=now,
+                    updated_at=now
+                )
+                
+                fill_values = {}
+                fill_conditions = []
+                for column_name in ("email", "department", "role"):
+                    current = getattr(Person, column_name)
+                    incoming = func.nullif(getattr(stmt.excluded, column_name), "")
+                    should_fill = and_(or_(current.is_(None), current == ""), incoming.isnot(None))
+                    fill_values[column_name] = case((should_fill, incoming), else_=current)
+                    fill_conditions.append(should_fill)
+                
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Person.name],
+                    set_={
+                        **fill_values,
+                        "updated_at": case((or_(*fill_conditions), now), else_=Person.updated_at)
+                    }
+                ).returning(Person)
+                
+                return session.scalars(
+                    stmt, execution_options={"populate_existing": True}
+                ).one()
+                
+            except SQLAlchemyError as e:
+                logger.error("인물 찾기/생성 실패", extra_data={"name": name, "error": str(e)})
+                raise_database_error("인물 처리 실패", {"name": name, "error": str(e)})
+    
     def update_person(self, person_id: int, person_data: dict) -> bool:
         """인물 정보 업데이트"""
         with self.get_session() as session:
@@ -679,13 +1338,32 @@ class OptimizedDatabaseManager:
                 return []
     
     def create_person_page_relation(self, relation_data: dict) -> Optional[PersonPageRelation]:
-        """인물-페이지 관계 생성"""
+        """인물-페이지 관계 생성 (같은 인물/페이지/관계 유형이 이미 있으면 저장하지 않고 None 반환)"""
         with self.get_session() as session:
             try:
+                if self.person_relation_unique_enabled:
+                    # INSERT ... ON CONFLICT DO NOTHING: 존재 확인과 저장을 한 문장으로 처리
+                    stmt = sqlite_insert(PersonPageRelation).values(**relation_data).on_conflict_do_nothing(
+                        index_elements=[
+                            PersonPageRelation.person_id,
+                            PersonPageRelation.page_id,
+                            PersonPageRelation.relation_type
+                        ]
+                    ).returning(PersonPageRelation)
+                    return session.scalars(stmt).first()
+                
+                # 유일 인덱스가 없는 경우: 존재 확인 후 생성
+                exists = session.execute(SELECT_RELATION_EXISTS, {
+                    "person_id": relation_data.get("person_id"),
+                    "page_id": relation_data.get("page_id"),
+                    "relation_type": relation_data.get("relation_type")
+                }).scalar()
+                if exists is not None:
+                    return None
+                
                 relation = PersonPageRelation(**relation_data)
                 session.add(relation)
-                session.commit()
-                session.refresh(relation)
+                session.flush()
                 return relation
             except SQLAlchemyError as e:
                 logger.error("인물-페이지 관계 생성 실패", extra_data={"relation_data": relation_data, "error": str(e)})
@@ -695,146 +1373,216 @@ class OptimizedDatabaseManager:
         """인물-페이지 관계가 이미 존재하는지 확인"""
         with self.get_session() as session:
             try:
-                relation = session.query(PersonPageRelation).filter(
-                    PersonPageRelation.person_id == person_id,
-                    PersonPageRelation.page_id == page_id,
-                    PersonPageRelation.relation_type == relation_type
-                ).first()
-                return relation is not None
+                exists = session.execute(
+                    SELECT_RELATION_EXISTS,
+                    {"person_id": person_id, "page_id": page_id, "relation_type": relation_type}
+                ).scalar()
+                return exists is not None
             except SQLAlchemyError as e:
                 logger.error("관계 존재 확인 실패", extra_data={"person_id": person_id, "page_id": page_id, "relation_type": relation_type, "error": str(e)})
                 return False
     
     # Space 관련 메서드들
     def get_all_spaces(self) -> List[dict]:
-        """모든 Space 목록 조회"""
+        """모든 Space 목록 조회 (페이지 변경 전까지 결과 캐시)"""
+        cached = self._get_cached("all_spaces")
+        if cached is not None:
+            return cached
+        
+        version = self._data_version
         with self.get_session() as session:
             try:
-                spaces = session.query(Page.space_key)\
+                # Space별 페이지 수를 GROUP BY 한 번으로 집계
+                page_count = func.count(Page.page_id)
+                spaces = session.query(Page.space_key, page_count)\
                     .filter(Page.space_key.isnot(None))\
-                    .distinct()\
+                    .group_by(Page.space_key)\
+                    .order_by(page_count.desc())\
                     .all()
                 
-                space_list = []
-                for space in spaces:
-                    space_key = space[0]
-                    page_count = session.query(Page).filter(Page.space_key == space_key).count()
-                    space_list.append({
-                        "space_key": space_key,
-                        "page_count": page_count
-                    })
-                
-                return sorted(space_list, key=lambda x: x['page_count'], reverse=True)
+                space_list = [
+                    {"space_key": space_key, "page_count": count}
+                    for space_key, count in spaces
+                ]
+                self._set_cached("all_spaces", version, space_list)
+                return list(space_list)
             except SQLAlchemyError as e:
                 logger.error("Space 목록 조회 실패", extra_data={"error": str(e)})
                 return []
     
-    def get_pages_by_space(self, space_key: str, page: int = 1, per_page: int = 20) -> dict:
-        """특정 Space의 페이지들 조회"""
+    def get_pages_by_space(self, space_key: str, page: int = 1, per_page: int = 20,
+                           cursor: Optional[str] = None) -> dict:
+        """
+        특정 Space의 페이지들 조회 (수정일 최신순)
+        
+        cursor(이전 응답의 next_cursor)를 주면 OFFSET 없이 마지막 행 다음부터 조회하며(keyset),
+        이때는 전체 개수(total) 계산을 생략합니다.
+        """
         with self.get_session() as session:
             try:
                 query = session.query(Page).filter(Page.space_key == space_key)
-                total = query.count()
                 
-                pages = query.offset((page - 1) * per_page).limit(per_page).all()
+                last_key = self._decode_page_cursor(cursor) if cursor else None
+                if last_key is not None:
+                    total = None
+                    query = self._after_page_key(query, last_key)
+                    offset = 0
+                else:
+                    total = query.count()
+                    offset = (page - 1) * per_page
+                
+                pages = query.order_by(*(key.desc() for key in PAGE_SORT_KEY))\
+                    .offset(offset)\
+                    .limit(per_page)\
+                    .all()
+                
+                next_cursor = self.page_cursor(pages[-1]) if len(pages) == per_page else None
                 
                 return {
                     "pages": [self._page_to_summary(p) for p in pages],
                     "total": total,
                     "page": page,
                     "per_page": per_page,
-                    "space_key": space_key
+                    "space_key": space_key,
+                    "next_cursor": next_cursor
                 }
             except SQLAlchemyError as e:
                 logger.error("Space별 페이지 조회 실패", extra_data={"space_key": space_key, "error": str(e)})
-                return {"pages": [], "total": 0, "page": page, "per_page": per_page, "space_key": space_key}
+                return {"pages": [], "total": 0, "page": page, "per_page": per_page, "space_key": space_key, "next_cursor": None}
+    
+    @staticmethod
+    def page_cursor(page: Page) -> str:
+        """keyset 페이지네이션 커서 생성 (마지막 행의 정렬 키)"""
+        raw = json.dumps([page.modified_date or "", page.page_id], ensure_ascii=False).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+    
+    @staticmethod
+    def _after_page_key(query, last_key: Tuple[str, str]):
+        """정렬 키(수정일, page_id)가 커서 키 다음인 행만 남기는 조건 추가"""
+        # (수정일, page_id) < 커서 키; 행 값 비교는 식 인덱스 범위 검색을 쓰지 못해 풀어서 작성
+        sort_date, sort_page_id = PAGE_SORT_KEY
+        last_date, last_page_id = last_key
+        return query.filter(
+            sort_date <= last_date,
+            or_(sort_date < last_date, sort_page_id < last_page_id)
+        )
+    
+    @staticmethod
+    def _decode_page_cursor(cursor: str) -> Optional[Tuple[str, str]]:
+        """keyset 페이지네이션 커서 해석 (잘못된 커서는 None)"""
+        try:
+            modified_date, page_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return str(modified_date), str(page_id)
+        except (ValueError, TypeError):
+            logger.warning("잘못된 페이지 커서", extra_data={"cursor": cursor})
+            return None
     
     def get_space_stats(self, space_key: str) -> dict:
         """특정 Space의 통계 정보"""
         with self.get_session() as session:
             try:
-                total_pages = session.query(Page).filter(Page.space_key == space_key).count()
-                
-                # 최근 수정된 페이지
-                recent_pages = session.query(Page)\
-                    .filter(Page.space_key == space_key)\
-                    .filter(Page.modified_date.isnot(None))\
-                    .count()
+                # 전체 페이지 수와 수정일이 있는 페이지 수를 한 번에 집계
+                total_pages, recent_pages = session.query(
+                    func.count(Page.page_id),
+                    func.count(Page.modified_date)
+                ).filter(Page.space_key == space_key).one()
                 
-                # 키워드 개수 계산
-                pages_with_keywords = session.query(Page)\
-                    .filter(Page.space_key == space_key)\
-                    .filter(Page.keywords.isnot(None))\
-                    .all()
-                
-                unique_keywords = set()
-                for page in pages_with_keywords:
-                    if page.keywords:
+                # 키워드 개수 계산 (JSON1로 SQLite 안에서 중복 제거)
+                try:
+                    unique_keywords = self._distinct_keywords(session, space_key)
+                except OperationalError:
+                    # JSON1을 사용할 수 없으면 keywords 컬럼만 스트리밍으로 조회해 Python에서 집계
+                    keywords_rows = session.query(Page.keywords)\
+                        .filter(Page.space_key == space_key)\
+                        .filter(Page.keywords.isnot(None))\
+                        .yield_per(1000)
+                    
+                    unique_keywords = set()
+                    for (keywords_json,) in keywords_rows:
                         try:
-                            keywords = json.loads(page.keywords)
-                            unique_keywords.update(keywords)
-                        except:
+                            unique_keywords.update(json_loads(keywords_json))
+                        except (ValueError, TypeError):
                             pass
+                    unique_keywords = list(unique_keywords)
                 
                 return {
                     "space_key": space_key,
                     "total_pages": total_pages,
                     "recent_pages": recent_pages,
                     "total_unique_keywords": len(unique_keywords),
-                    "top_keywords": list(unique_keywords)[:10]  # 상위 10개만
+                    "top_keywords": unique_keywords[:10]  # 상위 10개만
                 }
             except SQLAlchemyError as e:
                 logger.error("Space 통계 조회 실패", extra_data={"space_key": space_key, "error": str(e)})
                 return {"space_key": space_key, "total_pages": 0, "recent_pages": 0, "total_unique_keywords": 0, "top_keywords": []}
     
     def create_relationship(self, source_page_id: str, target_page_id: str, weight: float, common_keywords: List[str]) -> Optional[PageRelationship]:
-        """페이지 간 관계 생성"""
+        """
+        페이지 간 관계 생성
+        
+        관계는 방향이 없으므로 (작은 page_id, 큰 page_id) 순서로 저장하고,
+        이미 있는 쌍이면 더 큰 weight와 새 공통 키워드로 갱신합니다.
+        """
+        source_page_id, target_page_id = sorted((source_page_id, target_page_id))
+        common_keywords_json = json_dumps(common_keywords) if common_keywords else None
+        
         with self.get_session() as session:
             try:
-                # 이미 존재하는 관계인지 확인
-                existing_relationship = session.query(PageRelationship).filter(
-                    or_(
-                        and_(
-                            PageRelationship.source_page_id == source_page_id,
-                            PageRelationship.target_page_id == target_page_id
-                        ),
-                        and_(
-                            PageRelationship.source_page_id == target_page_id,
-                            PageRelationship.target_page_id == source_page_id
-                        )
+                if self.relationship_upsert_enabled:
+                    stmt = sqlite_insert(PageRelationship).values(
+                        source_page_id=source_page_id,
+                        target_page_id=target_page_id,
+                        weight=weight,
+                        common_keywords=common_keywords_json,
+                        created_at=datetime.utcnow()
                     )
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[PageRelationship.source_page_id, PageRelationship.target_page_id],
+                        set_={
+                            "weight": func.max(PageRelationship.weight, stmt.excluded.weight),
+                            "common_keywords": func.coalesce(
+                                stmt.excluded.common_keywords, PageRelationship.common_keywords
+                            )
+                        }
+                    ).returning(PageRelationship)
+                    
+                    return session.scalars(
+                        stmt, execution_options={"populate_existing": True}
+                    ).one()
+                
+                # 유일 인덱스가 없는 경우: 정방향 쌍 하나만 조회
+                existing_relationship = session.query(PageRelationship).filter(
+                    PageRelationship.source_page_id == source_page_id,
+                    PageRelationship.target_page_id == target_page_id
                 ).first()
                 
                 if existing_relationship:
                     # 기존 관계 업데이트
                     existing_relationship.weight = max(existing_relationship.weight, weight)
-                    if common_keywords:
-                        existing_relationship.common_keywords = json.dumps(common_keywords, ensure_ascii=False)
-                    session.commit()
+                    if common_keywords_json:
+                        existing_relationship.common_keywords = common_keywords_json
                     return existing_relationship
-                else:
-                    # 새 관계 생성
-                    relationship_data = {
-                        'source_page_id': source_page_id,
-                        'target_page_id': target_page_id,
-                        'weight': weight,
-                        'common_keywords': json.dumps(common_keywords, ensure_ascii=False) if common_keywords else None
+                
+                # 새 관계 생성
+                relationship = PageRelationship(
+                    source_page_id=source_page_id,
+                    target_page_id=target_page_id,
+                    weight=weight,
+                    common_keywords=common_keywords_json
+                )
+                session.add(relationship)
+                session.flush()
+                
+                logger.debug(
+                    "페이지 관계 생성 완료",
+                    extra_data={
+                        "source_page_id": source_page_id,
+                        "target_page_id": target_page_id,
+                        "weight": weight
                     }
-                    relationship = PageRelationship(**relationship_data)
-                    session.add(relationship)
-                    session.flush()
-                    session.refresh(relationship)
-                    
-                    logger.debug(
-                        "페이지 관계 생성 완료",
-                        extra_data={
-                            "source_page_id": source_page_id,
-                            "target_page_id": target_page_id,
-                            "weight": weight
-                        }
-                    )
-                    
-                    return relationship
+                )
+                
+                return relationship
                     
             except SQLAlchemyError as e:
                 logger.error(
@@ -848,10 +1596,13 @@ class OptimizedDatabaseManager:
                 return None
     
     def get_page_relationships(self, page_id: str) -> List[PageRelationship]:
-        """특정 페이지의 모든 관계 조회"""
+        """특정 페이지의 모든 관계 조회 (양쪽 페이지의 ID/제목을 같은 쿼리에서 함께 로드)"""
         with self.get_session() as session:
             try:
-                relationships = session.query(PageRelationship).filter(
+                relationships = session.query(PageRelationship).options(
+                    joinedload(PageRelationship.source_page).load_only(Page.page_id, Page.title),
+                    joinedload(PageRelationship.target_page).load_only(Page.page_id, Page.title)
+                ).filter(
                     or_(
                         PageRelationship.source_page_id == page_id,
                         PageRelationship.target_page_id == page_id
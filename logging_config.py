@@ -57,8 +57,15 @@ class ContextualLogger:
         self.logger = logging.getLogger(name)
         self.context = context or {}
     
+    def isEnabledFor(self, level: int) -> bool:
+        """해당 레벨 로그가 실제로 출력되는지 확인 (비활성 레벨의 extra_data 생성 생략용)"""
+        return self.logger.isEnabledFor(level)
+    
     def _log_with_context(self, level: int, message: str, extra_data: Optional[Dict[str, Any]] = None, **kwargs):
         """컨텍스트 정보와 함께 로그 출력"""
+        if not self.logger.isEnabledFor(level):
+            return
+        
         # 컨텍스트와 추가 데이터 병합
         merged_context = {**self.context}
         if extra_data:
@@ -14,7 +14,7 @@ from typing import Dict, Any, List, Optional
 from models import (
     ConfluenceConnection, ConnectionTestResult, ProcessRequest, 
     ProcessResponse, ProcessStatus, PageSummary, MindmapData,
-    PageListResponse, PageSearchRequest, PersonPageRelation
+    PageListResponse, PageSearchRequest, PersonPageRelation, json_dumps
 )
 from confluence_api import ConfluenceClient
 from llm_service import llm_service
@@ -33,7 +33,7 @@ from exception_handlers import (
     confluence_auto_exception_handler, custom_http_exception_handler,
     custom_validation_exception_handler, generic_exception_handler
 )
-from content_utils import ContentAnalyzer, ContentAnalysisResult, analyze_page_content, extract_fallback_keywords, clean_keywords
+from content_utils import ContentAnalysisResult, analyze_page_content, extract_fallback_keywords, clean_keywords
 
 # 로깅 시스템 초기화
 setup_logging()
@@ -130,7 +130,7 @@ async def process_pages(
     # 태스크 상태 초기화
     task_status[task_id] = {
         "status": "processing",
-        "progress": {"total": 0, "completed": 0},
+        "progress": {"total": 0, "completed": 0, "failed": 0},
         "started_at": datetime.now().isoformat(),
         "page_id": parent_page_id
     }
@@ -174,9 +174,9 @@ async def process_pages_background(
         
         logger.info(f"부모 페이지 조회 완료: {parent_page.get('title', 'Unknown')}")
         
-        # 모든 하위 페이지 조회
+        # 모든 하위 페이지 조회 (본문 없이 메타데이터만 - 변경된 페이지만 본문 조회)
         logger.info("하위 페이지 조회 시작")
-        all_pages = client.get_all_descendants(parent_page_id)
+        all_pages = client.get_all_descendants(parent_page_id, include_body=False)
         all_pages.insert(0, parent_page)  # 부모 페이지 포함
         
         logger.info(f"전체 페이지 수집 완료: {len(all_pages)}개")
@@ -186,7 +186,12 @@ async def process_pages_background(
         
         logger.info(f"총 {len(all_pages)}개 페이지 처리 시작")
         
-        processed_pages = []
+        processed_page_ids = []
+        
+        # 변경 여부 판단용 기존 수정일을 페이지마다 조회하지 않고 한 번에 조회
+        existing_modified_dates = db_manager.get_pages_modified_dates(
+            [page_data.get('id') for page_data in all_pages if page_data.get('id')]
+        )
         
         for i, page_data in enumerate(all_pages):
             try:
@@ -197,7 +202,7 @@ async def process_pages_background(
                 
                 # 페이지 수정 날짜 확인
                 current_modified = page_data.get('version', {}).get('when', '')
-                existing_modified = db_manager.get_page_modified_date(page_id)
+                existing_modified = existing_modified_dates.get(page_id)
                 
                 # 변경되지 않은 페이지는 건너뛰기
                 if existing_modified == current_modified:
@@ -205,6 +210,17 @@ async def process_pages_background(
                     task_status[task_id]["progress"]["completed"] += 1
                     continue
                 
+                # 메타데이터만 조회된 페이지는 이 시점에 본문 조회
+                # (본문 조회에 실패하면 저장하지 않아야 다음 동기화에서 다시 시도됨)
+                if 'body' not in page_data:
+                    full_page = client.get_page_content(page_id)
+                    if not full_page:
+                        logger.error(f"페이지 본문 조회 실패, 저장하지 않음: {title} ({page_id})")
+                        task_status[task_id]["progress"]["completed"] += 1
+                        task_status[task_id]["progress"]["failed"] += 1
+                        continue
+                    page_data = full_page
+                
                 # 페이지 콘텐츠 추출 (전체 BODY 내용)
                 logger.info(f"콘텐츠 추출 시작: {title}")
                 content = client.extract_text_from_content(page_data.get('body', {}))
@@ -212,8 +228,7 @@ async def process_pages_background(
                 logger.info(f"추출된 전체 BODY 콘텐츠 길이: {len(content) if content else 0}자")
                 
                 # 콘텐츠 분석
-                content_analyzer = ContentAnalyzer()
-                analysis_result = content_analyzer.analyze_content(content, title)
+                analysis_result = analyze_page_content(content, title)
                 
                 logger.info(f"콘텐츠 분석 완료: {analysis_result.content_type}, 특수키워드: {analysis_result.special_keywords}")
                 
@@ -359,18 +374,18 @@ async def process_pages_background(
                     'modified_date': current_modified,
                     'created_date': page_data.get('history', {}).get('createdDate', ''),
                     'created_by': created_by,
-                    'modified_by': modified_by
+                    'modified_by': modified_by,
+                    'keywords': json_dumps(keywords)  # 키워드 리스트를 JSON 문자열로 변환
                 }
                 
                 logger.info(f"DB 저장 예정 콘텐츠 길이: {len(content) if content else 0}자")
                 
-                if db_manager.page_exists(page_id):
+                # 존재 여부는 미리 조회한 수정일 목록으로 판단 (페이지마다 추가 조회 없음)
+                if page_id in existing_modified_dates:
                     db_manager.update_page(page_id, page_db_data)
                 else:
-                    # 키워드 리스트를 JSON 문자열로 변환
-                    page_obj = db_manager.create_page(page_db_data)
-                    page_obj.keywords_list = keywords
-                    db_manager.update_page(page_id, {'keywords': page_obj.keywords})
+                    db_manager.create_page(page_db_data)
+                existing_modified_dates[page_id] = current_modified
                 
                 # 인물 정보 추출 및 저장
                 if llm_service and content and len(content.strip()) > 100:
@@ -389,9 +404,8 @@ async def process_pages_background(
                                 'confidence_score': 1.0,
                                 'mentioned_context': f'페이지 생성자'
                             }
-                            # 중복 체크
-                            if not db_manager.relation_exists(creator_person.person_id, page_id, 'creator'):
-                                db_manager.create_person_page_relation(relation_data)
+                            # 이미 있는 관계는 저장하지 않음 (중복 체크 포함)
+                            db_manager.create_person_page_relation(relation_data)
                         
                         if modified_by and modified_by != created_by:
                             modifier_person = db_manager.find_or_create_person(modified_by)
@@ -403,9 +417,8 @@ async def process_pages_background(
                                 'confidence_score': 1.0,
                                 'mentioned_context': f'페이지 최종 수정자'
                             }
-                            # 중복 체크
-                            if not db_manager.relation_exists(modifier_person.person_id, page_id, 'modifier'):
-                                db_manager.create_person_page_relation(relation_data)
+                            # 이미 있는 관계는 저장하지 않음 (중복 체크 포함)
+                            db_manager.create_person_page_relation(relation_data)
                         
                         # LLM 추출 인물들 저장
                         for extracted_person in person_extraction.persons:
@@ -431,9 +444,8 @@ async def process_pages_background(
                                     'mentioned_context': extracted_person.mentioned_context
                                 }
                                 
-                                # 중복 체크 (같은 페이지에서 같은 사람의 언급 관계)
-                                if not db_manager.relation_exists(person.person_id, page_id, 'mentioned'):
-                                    db_manager.create_person_page_relation(relation_data)
+                                # 같은 페이지에서 같은 사람의 언급 관계가 이미 있으면 저장하지 않음
+                                if db_manager.create_person_page_relation(relation_data):
                                     logger.info(f"인물 관계 저장: {person.name} -> {title}")
                                 
                             except Exception as e:
@@ -444,7 +456,7 @@ async def process_pages_background(
                     except Exception as e:
                         logger.warning(f"인물 정보 추출 실패 ({title}): {str(e)}")
                 
-                processed_pages.append(db_manager.get_page(page_id))
+                processed_page_ids.append(page_id)
                 
                 # 진행 상태 업데이트
                 task_status[task_id]["progress"]["completed"] += 1
@@ -454,9 +466,11 @@ async def process_pages_background(
             except Exception as e:
                 logger.error(f"페이지 처리 오류: {str(e)}")
                 task_status[task_id]["progress"]["completed"] += 1
+                task_status[task_id]["progress"]["failed"] += 1
                 continue
         
-        # 마인드맵 관계 업데이트
+        # 처리한 페이지를 한 번에 다시 조회해 마인드맵 관계 업데이트
+        processed_pages = db_manager.get_pages_batch(processed_page_ids)
         if processed_pages:
             mindmap_service.update_relationships(processed_pages)
         
@@ -608,13 +622,13 @@ async def spaces_page(request: Request):
     return templates.TemplateResponse("spaces.html", {"request": request})
 
 @app.get("/pages", response_model=PageListResponse)
-async def get_pages(page: int = 1, per_page: int = 20):
-    """모든 페이지 조회 (페이징)"""
+async def get_pages(page: int = 1, per_page: int = 20, cursor: Optional[str] = None):
+    """모든 페이지 조회 (페이징, cursor: 이전 응답의 next_cursor)"""
     if per_page > 100:
         per_page = 100  # 최대 100개로 제한
     
     offset = (page - 1) * per_page
-    pages = db_manager.get_all_pages(offset=offset, limit=per_page)
+    pages = db_manager.get_all_pages(offset=offset, limit=per_page, cursor=cursor)
     total = db_manager.count_pages()
     
     page_summaries = []
@@ -632,7 +646,8 @@ async def get_pages(page: int = 1, per_page: int = 20):
         pages=page_summaries,
         total=total,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        next_cursor=db_manager.page_cursor(pages[-1]) if len(pages) == per_page else None
     )
 
 @app.post("/pages/search", response_model=PageListResponse)
@@ -700,20 +715,15 @@ async def get_pages_stats():
     total_pages = db_manager.count_pages()
     recent_pages = db_manager.get_recent_pages(limit=5)
     
-    # 키워드 통계
-    all_keywords = []
-    for page in db_manager.get_all_pages(limit=1000):  # 최대 1000개만 분석
-        all_keywords.extend(page.keywords_list)
-    
-    from collections import Counter
-    keyword_counts = Counter(all_keywords)
-    top_keywords = keyword_counts.most_common(10)
-    
+    # 키워드 통계 (DB에서 전체 페이지 기준으로 집계)
+    top_keywords = db_manager.get_keyword_counts(limit=10)
+    total_unique_keywords = len(db_manager.get_all_keywords())
+
     return {
         "total_pages": total_pages,
         "recent_pages": len(recent_pages),
         "top_keywords": [{"keyword": k, "count": c} for k, c in top_keywords],
-        "total_unique_keywords": len(keyword_counts)
+        "total_unique_keywords": total_unique_keywords
     }
 
 @app.get("/pages/{page_id}/content")
@@ -754,8 +764,7 @@ async def regenerate_page_summary(page_id: str, use_chunking: bool = None):
         logger.info(f"페이지 요약/키워드 재생성 시작: {page.title} ({page_id})")
         
         # 콘텐츠 분석
-        content_analyzer = ContentAnalyzer()
-        analysis_result = content_analyzer.analyze_content(page.content, page.title)
+        analysis_result = analyze_page_content(page.content, page.title)
         
         logger.info(f"콘텐츠 분석 완료: {analysis_result.content_type}, 특수키워드: {analysis_result.special_keywords}")
         
@@ -915,10 +924,12 @@ async def analyze_page_chunks(page_id: str):
         raise HTTPException(status_code=500, detail=f"Chunking 분석 중 오류 발생: {str(e)}")
 
 @app.delete("/pages/{page_id}")
-async def delete_page(page_id: str):
+async def delete_page(page_id: str, background_tasks: BackgroundTasks):
     """페이지 삭제"""
     success = db_manager.delete_page(page_id)
     if success:
+        # 삭제로 비워진 DB 페이지는 응답 후 조금씩 회수
+        background_tasks.add_task(db_manager.incremental_vacuum)
         return {"message": "페이지가 삭제되었습니다.", "page_id": page_id}
     else:
         raise HTTPException(status_code=404, detail="페이지를 찾을 수 없습니다.")
@@ -1025,8 +1036,8 @@ async def get_user_mindmap(user_name: str, relation_type: str = "all"):
         
         # 페이지 정보 수집
         page_ids = [r.page_id for r in relations]
-        pages = [db_manager.get_page(page_id) for page_id in page_ids]
-        pages = [p for p in pages if p]  # None 제거
+        pages_by_id = {p.page_id: p for p in db_manager.get_pages_batch(page_ids)}
+        pages = [pages_by_id[page_id] for page_id in page_ids if page_id in pages_by_id]  # 없는 페이지 제외
         
         # 노드 생성: 사용자 중심 노드 + 문서 노드 + 키워드 노드
         nodes = []
@@ -1268,11 +1279,12 @@ async def get_space_stats(space_key: str):
 async def get_space_pages(
     space_key: str,
     page: int = 1,
-    per_page: int = 20
+    per_page: int = 20,
+    cursor: Optional[str] = None
 ):
-    """특정 Space의 페이지들 조회"""
+    """특정 Space의 페이지들 조회 (cursor: 이전 응답의 next_cursor)"""
     try:
-        result = db_manager.get_pages_by_space(space_key, page, per_page)
+        result = db_manager.get_pages_by_space(space_key, page, per_page, cursor)
         return result
     except Exception as e:
         logger.error(f"Space 페이지 조회 오류: {str(e)}")
@@ -140,12 +140,12 @@ class MindmapService:
     
     def get_page_connections(self, page_id: str) -> List[Dict]:
         """특정 페이지의 연결 정보 조회"""
-        relationships = db_manager.get_relationships(page_id)
+        relationships = db_manager.get_page_relationships(page_id)
         connections = []
         
         for rel in relationships:
-            connected_page_id = rel.target_page_id if rel.source_page_id == page_id else rel.source_page_id
-            connected_page = db_manager.get_page(connected_page_id)
+            # 연결된 페이지는 관계 조회 시 함께 로드됨 (페이지별 추가 조회 없음)
+            connected_page = rel.target_page if rel.source_page_id == page_id else rel.source_page
             
             if connected_page:
                 connections.append({
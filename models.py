@@ -6,8 +6,29 @@ import json
 from typing import List, Optional
 from pydantic import BaseModel
 
+# orjson 라이브러리 가져오기 시도 (Rust 기반 고속 JSON 직렬화)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 Base = declarative_base()
 
+
+def json_dumps(value) -> str:
+    """TEXT 컬럼 저장용 JSON 직렬화 (orjson이 있으면 orjson 사용, 비ASCII 문자는 그대로 유지)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False)
+
+
+def json_loads(text):
+    """TEXT 컬럼의 JSON 역직렬화 (오류는 json.JSONDecodeError 계열로 발생)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
 class Page(Base):
     __tablename__ = 'pages'
     
@@ -26,11 +47,11 @@ class Page(Base):
     
     @property
     def keywords_list(self) -> List[str]:
-        return json.loads(self.keywords) if self.keywords else []
+        return json_loads(self.keywords) if self.keywords else []
     
     @keywords_list.setter
     def keywords_list(self, value: List[str]):
-        self.keywords = json.dumps(value, ensure_ascii=False)
+        self.keywords = json_dumps(value)
 
 class PageRelationship(Base):
     __tablename__ = 'page_relationships'
@@ -42,13 +63,25 @@ class PageRelationship(Base):
     common_keywords = Column(Text)  # JSON string
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # 관계 설정 (세션 종료 후 지연 로딩은 불가능하므로 조회 시 joinedload로 함께 로드)
+    source_page = relationship("Page", foreign_keys=[source_page_id], lazy="raise")
+    target_page = relationship("Page", foreign_keys=[target_page_id], lazy="raise")
+    
     @property
     def common_keywords_list(self) -> List[str]:
-        return json.loads(self.common_keywords) if self.common_keywords else []
+        return json_loads(self.common_keywords) if self.common_keywords else []
     
     @common_keywords_list.setter
     def common_keywords_list(self, value: List[str]):
-        self.common_keywords = json.dumps(value, ensure_ascii=False)
+        self.common_keywords = json_dumps(value)
+
+class PageKeyword(Base):
+    """페이지 키워드 역색인 (pages.keywords JSON 배열을 DB 트리거가 펼쳐 저장, 직접 쓰지 않음)"""
+    __tablename__ = 'page_keywords'
+    __table_args__ = {'sqlite_with_rowid': False}
+    
+    page_id = Column(String, primary_key=True)
+    keyword = Column(String, primary_key=True)
 
 class Person(Base):
     __tablename__ = 'persons'
@@ -141,6 +174,7 @@ class PageListResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    next_cursor: Optional[str] = None  # 다음 목록 조회용 keyset 커서 (/pages)
 
 class PageSearchRequest(BaseModel):
     query: Optional[str] = None